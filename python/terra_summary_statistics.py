@@ -1,18 +1,27 @@
 import logging
 import os.path
-from typing import Any, Tuple, Optional
-from pandas import DataFrame
+import sys
+import json
+import csv
+import sqlite3
+from hashlib import blake2b
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Tuple, Optional, Iterable, Iterator, cast
+from collections import Counter
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
+from concurrent import futures
 from argparse import ArgumentParser, Namespace
 from datetime import datetime
 
 from utils.requests_utils.request_util import RunRequest
 from utils.token_util import Token
-from utils import GCP
+from utils import GCP, ARG_DEFAULTS
 from utils.tdr_utils.tdr_schema_utils import InferTDRSchema
 from utils.terra_utils.terra_util import TerraWorkspace
-from utils.csv_util import Csv
 
 logging.basicConfig(
     format="%(levelname)s: %(asctime)s : %(message)s", level=logging.INFO
@@ -26,9 +35,21 @@ REQUIRED_OUTPUT_HEADERS = [
     "unique_value_count", "value_not_in_ref_col_count", "non_allowed_value_count", "flagged", "flag_notes"
 ]
 
+# Output columns computed from the workspace. Any other output column is copied from the input data dictionary
+COMPUTED_OUTPUT_HEADERS = [
+    "table_name", "column_name", "label", "description", "inferred_data_type", "inferred_multiple_values_allowed",
+    "record_count", "null_value_count", "unique_value_count", "value_not_in_ref_col_count",
+    "non_allowed_value_count", "flagged", "flag_notes"
+]
+
 ALL_FIELDS_NON_REQUIRED = True
 FORCE_COLUMNS_TO_STRING = True
 NA = "N/A"
+LIST_TYPES = frozenset([list, set, np.ndarray])
+SCHEMA_CACHE_DB = os.path.join(os.path.expanduser("~"), ".cache", "terra_summary", "schema.db")
+# Part of every schema cache key. Bump it when InferTDRSchema or the way tables are read changes the inferred schema
+# so schemas cached by an older version are not used
+SCHEMA_CACHE_VERSION = 1
 
 INPUT_DT_TO_INFERRED_DTS = {
     "boolean": "boolean",
@@ -51,20 +72,51 @@ def get_args() -> Namespace:
         help=f"Input tsv to validate against what exists in the workspace. Headers should:  {INPUT_HEADERS}. "
              "Not required and if provided does not need every column filled out"
     )
+    parser.add_argument(
+        "--no_schema_cache",
+        action="store_true",
+        help=f"Infer every table's schema instead of reusing schemas cached in {SCHEMA_CACHE_DB} by earlier runs"
+    )
     return parser.parse_args()
 
 
+def read_data_dictionary(data_dictionary_file: str) -> Tuple[list[str], list[dict]]:
+    """Read the data dictionary in one pass and return its headers in order and its rows"""
+    with open(data_dictionary_file) as f:
+        # Short rows get empty strings for the missing cells, the same as empty cells
+        dict_reader = csv.DictReader(f, delimiter='\t', skipinitialspace=True, restval="")
+        input_headers = list(dict_reader.fieldnames or [])
+        missing_headers = set(INPUT_HEADERS) - set(input_headers)
+        if missing_headers:
+            logging.error(f"Missing expected headers: {','.join(missing_headers)}")
+            raise ValueError(f"Expected headers not in {data_dictionary_file}")
+        data_dict_contents = []
+        for row in dict_reader:
+            # Cells past the last header (including the empty cell after a trailing tab) have no column to go in
+            extra_cells = row.pop(None, [])
+            if any(extra_cells):
+                logging.warning(
+                    f"Ignoring {len(extra_cells)} cell(s) past the last header on line {dict_reader.line_num} of "
+                    f"{data_dictionary_file}"
+                )
+            data_dict_contents.append(row)
+    return input_headers, data_dict_contents
+
+
 class ParseInputDataDict:
     def __init__(self, data_dict_contents: list[dict]):
         self.data_dict_contents = data_dict_contents
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _convert_to_bool(value: str) -> Any:
+        # Cached since most cells repeat the same few values (y, n, data types, table names)
         if not value:
             return None
-        if value.lower() == 'y':
+        lowered_value = value.lower()
+        if lowered_value == 'y':
             return True
-        elif value.lower() == 'n':
+        elif lowered_value == 'n':
             return False
         else:
             return value
@@ -73,113 +125,241 @@ class ParseInputDataDict:
         if not self.data_dict_contents:
             return {}
         # Create a dictionary with the key being a tuple of table_name and column_name
+        # Intern the names so the keys share string objects with the workspace table and column names
         return {
-            (row['table_name'], row['column_name']): {k: self._convert_to_bool(v) for k, v in row.items()}
+            (sys.intern(row['table_name']), sys.intern(row['column_name'])): {
+                k: self._convert_to_bool(v) for k, v in row.items()
+            }
             for row in self.data_dict_contents
         }
 
 
+class SchemaCache:
+    """Persist inferred schemas keyed by a fingerprint of the table contents so repeat runs skip inference"""
+
+    def __init__(self, db_path: str = SCHEMA_CACHE_DB):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Tables are processed in worker threads so share one connection and serialise access to it
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = Lock()
+        self.connection.execute("CREATE TABLE IF NOT EXISTS schemas (fp TEXT PRIMARY KEY, json TEXT)")
+
+    @staticmethod
+    def create_fingerprint(table_name: str, table_contents: list[dict]) -> str:
+        column_names = sorted({column for row in table_contents for column in row})
+        content_hash = blake2b(
+            json.dumps(table_contents, sort_keys=True, default=str).encode(), digest_size=16
+        ).hexdigest()
+        # Include the cache version and inference settings so a change to either misses instead of reusing old schemas
+        return json.dumps(
+            [
+                SCHEMA_CACHE_VERSION, ALL_FIELDS_NON_REQUIRED, FORCE_COLUMNS_TO_STRING,
+                table_name, len(table_contents), column_names, content_hash
+            ]
+        )
+
+    def get(self, fingerprint: str) -> Optional[dict]:
+        with self.lock:
+            row = self.connection.execute("SELECT json FROM schemas WHERE fp = ?", (fingerprint,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, fingerprint: str, schema: dict) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO schemas (fp, json) VALUES (?, ?)", (fingerprint, json.dumps(schema))
+            )
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
 class GetTablesInfo:
-    def __init__(self, workspace: TerraWorkspace):
+    def __init__(self, workspace: TerraWorkspace, schema_cache: Optional[SchemaCache] = None):
         self.workspace = workspace
+        self.schema_cache = schema_cache
 
     def _convert_cell(self, cell_value: Any) -> Tuple[Any, Optional[str]]:
+        # Most cells are plain values, so return those before doing any dictionary lookups
+        if type(cell_value) is not dict:
+            return cell_value, None
+        get_key = cell_value.get
+        # If the cell value is a dictionary, check if it has an entityName key
+        # Which means it is a linked entity. Turn the cell value into the entity name
+        entity_name = get_key("entityName")
+        if entity_name:
+            linked_table = get_key("entityType")
+            return entity_name, f"{linked_table}.{linked_table}_id"
+        entity_list = get_key("items")
+        if type(entity_list) is not list:
+            return cell_value, None
+        # If the cell value is a list, only convert the items that are dictionaries. Plain values are kept as is
+        # and do not change the linked column
         linked_column = None
-        if isinstance(cell_value, dict):
-            # If the cell value is a dictionary, check if it has an entityName key
-            # Which means it is a linked entity
-            entity_name = cell_value.get("entityName")
-            if entity_name:
-                linked_table = cell_value.get("entityType")
-                linked_column = f"{linked_table}.{linked_table}_id"
-                # Turn the cell value into the entity name
-                cell_value = entity_name
-            # If the cell value is a list of dictionaries, recursively call this function on each dictionary
-            else:
-                entity_list = cell_value.get("items")
-                if entity_list or entity_list == []:
-                    new_list = []
-                    # For each item in the list, convert the cell value
-                    for item in entity_list:
-                        cell_value, linked_column = self._convert_cell(item)
-                        new_list.append(cell_value)
-                    cell_value = new_list
-        return cell_value, linked_column
+        new_list: list[Any] = []
+        append = new_list.append
+        for item in entity_list:
+            if type(item) is dict:
+                item, linked_column = self._convert_cell(item)
+            append(item)
+        return new_list, linked_column
+
+    @staticmethod
+    def _arrow_column_stats(column_values: list) -> Optional[Tuple[int, int]]:
+        """Return (empty_cells, distinct_values) using Arrow kernels, or None if the column needs the pandas path."""
+        try:
+            # from_pandas treats NaN as null, the same as pandas does
+            column_array = pa.array(column_values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            # Mixed types (e.g. ints and strings) or values Arrow can't hold natively
+            return None
+        if pa.types.is_null(column_array.type):
+            return len(column_array), 0
+        # List and dict cells need to be canonicalised before they can be compared
+        if pa.types.is_nested(column_array.type):
+            return None
+        empty_cells = column_array.null_count
+        if pa.types.is_string(column_array.type):
+            empty_cells += pc.sum(pc.equal(column_array, "")).as_py() or 0
+        return empty_cells, pc.count_distinct(column_array).as_py()
 
     @staticmethod
-    def _update_dict_with_content_stats(table_contents: list[dict], column_info: dict) -> None:
-        df = DataFrame(table_contents)
+    def _counter_column_stats(column_values: list) -> Tuple[int, int]:
+        """Return (empty_cells, distinct_values) for columns Arrow can't handle, such as list or mixed type columns"""
+        # Lists are compared as their sorted values joined into a string, so an empty list counts as an empty cell
+        value_counts = Counter(
+            ", ".join(sorted(map(str, value))) if type(value) in LIST_TYPES else value for value in column_values
+        )
+        # Null cells are empty but are not counted as a distinct value. Empty strings are both
+        null_count = value_counts.pop(None, 0)
+        return null_count + value_counts.get("", 0), len(value_counts)
+
+    @staticmethod
+    def _transpose_table_contents(table_contents: list[dict], column_names: Iterable[str]) -> dict[str, list]:
+        """Turn the rows into one list of values per column in a single pass. Missing cells are left out"""
+        columns: dict[str, list] = {column_name: [] for column_name in column_names}
+        for row in table_contents:
+            for column_name, cell_value in row.items():
+                columns[column_name].append(cell_value)
+        return columns
+
+    @staticmethod
+    def _update_dict_with_content_stats(table_columns: dict[str, list], column_info: dict, row_count: int) -> None:
         for column_name, column_dict in column_info.items():
-            processed_column = df[column_name].apply(
-                lambda x: ", ".join(sorted(map(str, x))) if isinstance(x, (list, set, np.ndarray)) else x
-            )
-            # Count empty cells (including null and empty arrays)
-            column_dict["empty_cells"] = int(processed_column.isnull().sum() + (processed_column == "").sum())
-            # Count distinct values (using sorted strings for consistency)
-            column_dict["distinct_values"] = int(processed_column.nunique())
+            # Build one Arrow array per column instead of a table from the rows, since a table's schema would be
+            # inferred from the first row only and columns can be missing from any row
+            column_values = table_columns[column_name]
+            column_stats = GetTablesInfo._arrow_column_stats(column_values)
+            if column_stats is None:
+                column_stats = GetTablesInfo._counter_column_stats(column_values)
+            empty_cells, column_dict["distinct_values"] = column_stats
+            # Rows without the column are empty cells too
+            column_dict["empty_cells"] = empty_cells + row_count - len(column_values)
 
     def _create_table_info_dict(self, table_name: str, table_info: dict) -> dict:
         table_dict = {
             'primary_key': table_info['idName'],
             'total_rows': table_info['count'],
-            'table_contents': [],
             'column_info': {}
         }
-        table_metrics = terra.get_gcp_workspace_metrics(entity_type=table_name)
+        column_info = table_dict['column_info']
+        table_contents = []
+        table_metrics = self.workspace.get_gcp_workspace_metrics(entity_type=table_name)
         for row in table_metrics:
-            id_column = f"{row['entityType']}_id"
+            # Intern table and column names since the same few strings are used as keys for every row
+            id_column = sys.intern(f"{row['entityType']}_id")
             reformatted_row = {id_column: row['name']}
-            table_dict['column_info'][id_column] = {
-                'primary_key': True,
-                'linked_column': None,
-                'record_count': table_info['count']
-            }
+            # Only create the column info the first time the column is seen
+            if id_column not in column_info:
+                column_info[id_column] = {
+                    'primary_key': True,
+                    'linked_column': None,
+                    'record_count': table_info['count']
+                }
             for column, cell in row['attributes'].items():
+                column = sys.intern(column)
                 cell_value, linked_column = self._convert_cell(cell)
                 reformatted_row[column] = cell_value
-                table_dict['column_info'][column] = {
-                    'primary_key': False,
-                    'linked_column': linked_column,
-                    'record_count': table_info['count']
-                }
-            table_dict['table_contents'].append(reformatted_row)
-        self._update_dict_with_content_stats(table_dict['table_contents'], table_dict['column_info'])
+                column_dict = column_info.get(column)
+                if column_dict is None:
+                    column_info[column] = {
+                        'primary_key': False,
+                        'linked_column': linked_column,
+                        'record_count': table_info['count']
+                    }
+                # Empty lists have no linked column so fill it in once a linked value is found
+                elif linked_column and not column_dict['linked_column']:
+                    column_dict['linked_column'] = linked_column
+            table_contents.append(reformatted_row)
+        # Keep the contents one list per column. The checks against the data dictionary only ever look at one
+        # column at a time, so the rows themselves are not needed once the schema has been inferred
+        table_dict['table_columns'] = self._transpose_table_contents(table_contents, column_info)
+        self._update_dict_with_content_stats(table_dict['table_columns'], column_info, len(table_contents))
+        # Infer the schema while this table is being processed rather than after every table is loaded
+        self._add_inferred_info(table_name, table_contents, column_info)
         return table_dict
 
-    def run(self) -> dict:
-        tables_dict = {}
-        tables_info = terra.get_workspace_entity_info()
-        for table_name, table_info in tables_info.items():
-            tables_dict[table_name] = self._create_table_info_dict(table_name, table_info)
-        return tables_dict
-
-
-class AddInferredInfo:
-    def __init__(self, tables_info: dict):
-        self.tables_info = tables_info
-
-    def run(self) -> dict:
-        for table_name, table_info in self.tables_info.items():
+    def _add_inferred_info(self, table_name: str, table_contents: list[dict], column_info: dict) -> None:
+        # Without a schema cache every table's schema is inferred
+        fingerprint = SchemaCache.create_fingerprint(table_name, table_contents) if self.schema_cache else ""
+        inferred_schema = self.schema_cache.get(fingerprint) if self.schema_cache else None
+        if inferred_schema:
+            logging.info(f"Using cached schema for table {table_name}")
+        else:
             inferred_schema = InferTDRSchema(
                 table_name=table_name,
-                input_metadata=tables_info[table_name]['table_contents'],
+                input_metadata=table_contents,
                 all_fields_non_required=ALL_FIELDS_NON_REQUIRED,
                 allow_disparate_data_types_in_column=FORCE_COLUMNS_TO_STRING
             ).infer_schema()
-            # Add the inferred schema to the table_info dictionary
-            for inferred_column in inferred_schema['columns']:
-                column_dict = table_info['column_info'][inferred_column['name']]
-                column_dict['inferred_data_type'] = inferred_column['datatype']
-                column_dict['inferred_multiple_values_allowed'] = inferred_column['array_of']
-        return self.tables_info
+            if self.schema_cache:
+                self.schema_cache.put(fingerprint, inferred_schema)
+        # Add the inferred schema to the column info dictionary
+        for inferred_column in inferred_schema['columns']:
+            column_dict = column_info[inferred_column['name']]
+            column_dict['inferred_data_type'] = inferred_column['datatype']
+            column_dict['inferred_multiple_values_allowed'] = inferred_column['array_of']
+
+    def run(self) -> dict:
+        tables_info = self.workspace.get_workspace_entity_info()
+        if not tables_info:
+            return {}
+        # Each table is fetched with its own blocking request so pull them down in parallel. Requests are already
+        # retried by RunRequest, so fail on the first table that can't be loaded and say which one it was
+        table_dicts = {}
+        workers = min(cast(int, ARG_DEFAULTS["multithread_workers"]), len(tables_info))
+        with futures.ThreadPoolExecutor(workers) as pool:
+            future_to_table = {
+                pool.submit(self._create_table_info_dict, table_name, table_info): table_name
+                for table_name, table_info in tables_info.items()
+            }
+            for future in futures.as_completed(future_to_table):
+                table_name = future_to_table[future]
+                try:
+                    table_dicts[table_name] = future.result()
+                except Exception as e:
+                    logging.error(f"Failed to get info for table {table_name}: {e}")
+                    raise ValueError(f"Failed to get info for table {table_name}: {e}") from e
+        # Keep tables in the same order the workspace returned them
+        return {table_name: table_dicts[table_name] for table_name in tables_info}
 
 
 class CompareExpectedToActual:
-    def __init__(self, expected_data: dict, actual_workspace_info: dict):
+    def __init__(self, expected_data: dict, actual_workspace_info: dict, output_headers: list[str]):
         self.expected_data = expected_data
         self.actual_workspace_info = actual_workspace_info
+        self.output_headers = output_headers
+        # For each output column get the position of its computed value, or None if it is copied from expected_info
+        self._header_sources = [
+            (COMPUTED_OUTPUT_HEADERS.index(header) if header in COMPUTED_OUTPUT_HEADERS else None, header)
+            for header in output_headers
+        ]
+        # String values of each referenced column, built the first time the column is referenced
+        self._ref_sets: dict[Tuple[str, str], frozenset[str]] = {}
+        # Compiled allowed value patterns, keyed by the pattern string since columns often share a pattern
+        self._compiled_patterns: dict[str, re.Pattern] = {}
 
-    def _create_row_dict(
+    def _create_row_tuple(
             self,
             table: str,
             column: str,
@@ -191,33 +371,30 @@ class CompareExpectedToActual:
             flag_notes: str,
             value_not_in_ref_col_count: int,
             non_allowed_value_count: int
-    ) -> dict:
-        base_dict = {
-            'table_name': table,
-            'column_name': column,
-            'label': label,
-            'description': description,
-            'data_type': expected_info.get('data_type'),
-            'multiple_values_allowed': expected_info.get('multiple_values_allowed'),
-            'primary_key': expected_info.get('primary_key'),
-            'refers_to_column': expected_info.get('refers_to_column'),
-            'required': expected_info.get('required'),
-            'inferred_multiple_values_allowed': column_dict['inferred_multiple_values_allowed'],
-            'inferred_data_type': column_dict['inferred_data_type'],
-            'record_count': column_dict['record_count'],
-            'null_value_count': column_dict['empty_cells'],
-            'unique_value_count': column_dict['distinct_values'],
-            'allowed_values_list': expected_info.get('allowed_values_list'),
-            'allowed_values_pattern': expected_info.get('allowed_values_pattern'),
-            'value_not_in_ref_col_count': value_not_in_ref_col_count,
-            'non_allowed_value_count': non_allowed_value_count,
-            'flagged': flagged,
-            'flag_notes': flag_notes
-        }
-        # Add any extra key-value pairs from expected_info
-        additional_info = {k: v for k, v in expected_info.items() if k not in base_dict}
-        base_dict.update(additional_info)
-        return base_dict
+    ) -> tuple:
+        """Create the output row as a tuple in the same order as output_headers"""
+        # Must be in the same order as COMPUTED_OUTPUT_HEADERS
+        computed_values = (
+            table,
+            column,
+            label,
+            description,
+            column_dict['inferred_data_type'],
+            column_dict['inferred_multiple_values_allowed'],
+            column_dict['record_count'],
+            column_dict['empty_cells'],
+            column_dict['distinct_values'],
+            value_not_in_ref_col_count,
+            non_allowed_value_count,
+            flagged,
+            flag_notes
+        )
+        return tuple(
+            [
+                computed_values[index] if index is not None else expected_info.get(header)
+                for index, header in self._header_sources
+            ]
+        )
 
     @staticmethod
     def _compare_values(expected: Any, actual: Any, column: str) -> Tuple[bool, str]:
@@ -242,19 +419,25 @@ class CompareExpectedToActual:
             note = ""
         return flagged, note
 
-    @staticmethod
-    def _validate_column_contents(expected_info: dict, actual_column_info: list[Any]) -> Tuple[bool, str, int]:
+    def _validate_column_contents(
+            self, expected_info: dict, actual_column_info: list[Any], column_strings: list[str]
+    ) -> Tuple[bool, str, int]:
         flagged = False
         flag_notes = ""
         non_allowed_value_count = 0
         allowed_values = expected_info.get('allowed_values_list')
         if allowed_values:
-            allowed_values_list = [
+            # Use a set so each value is checked against the allowed values in constant time
+            allowed_values_list = frozenset(
                 allowed_value.strip()
                 for allowed_value in allowed_values.split(',')
+            )
+            # Check if any of the actual values are not in the allowed values list. Allowed values are strings
+            # so any other value (including unhashable lists) can't be in it
+            not_allowed_values = [
+                value for value in actual_column_info
+                if not (isinstance(value, str) and value in allowed_values_list)
             ]
-            # Check if any of the actual values are not in the allowed values list
-            not_allowed_values = [value for value in actual_column_info if value not in allowed_values_list]
             if not_allowed_values:
                 flagged = True
                 flag_notes = "Column contains values not in allowed value list"
@@ -262,8 +445,12 @@ class CompareExpectedToActual:
                 non_allowed_value_count = len(not_allowed_values)
         allowed_pattern = expected_info.get('allowed_values_pattern')
         if allowed_pattern:
+            compiled_pattern = self._compiled_patterns.get(allowed_pattern)
+            if compiled_pattern is None:
+                compiled_pattern = re.compile(allowed_pattern)
+                self._compiled_patterns[allowed_pattern] = compiled_pattern
             # Check if any of the actual values do not match the allowed pattern
-            not_matching_values = [value for value in actual_column_info if not re.search(allowed_pattern, str(value))]
+            not_matching_values = [value for value in column_strings if not compiled_pattern.search(value)]
             if not_matching_values:
                 flagged = True
                 if flag_notes:
@@ -283,7 +470,7 @@ class CompareExpectedToActual:
         return flagged, flag_notes
 
     def _check_referenced_column(
-            self, refers_to_column: Optional[str], column_contents: list[Any]
+            self, refers_to_column: Optional[str], column_strings: list[str]
     ) -> Tuple[bool, str, int]:
         flagged = False
         flag_notes = ""
@@ -293,21 +480,22 @@ class CompareExpectedToActual:
             if table not in self.actual_workspace_info:
                 flagged = True
                 flag_notes = "Referenced table not found in workspace"
-                value_not_in_ref_col_count = len(column_contents)
+                value_not_in_ref_col_count = len(column_strings)
             elif column not in self.actual_workspace_info[table]['column_info']:
                 flagged = True
                 flag_notes = "Referenced column not found in workspace"
-                value_not_in_ref_col_count = len(column_contents)
+                value_not_in_ref_col_count = len(column_strings)
             else:
-                # Get the contents of the referenced column and convert them to strings
-                # for comparison with the actual column contents
-                referenced_column_contents = [
-                    str(row[column]) for row in
-                    self.actual_workspace_info[table]['table_contents']
-                ]
+                # Get the contents of the referenced column as a set of strings for comparison with the
+                # actual column contents. Many columns can refer to the same column so only build it once
+                referenced_column_contents = self._ref_sets.get((table, column))
+                if referenced_column_contents is None:
+                    referenced_column_contents = frozenset(
+                        map(str, self.actual_workspace_info[table]['table_columns'][column])
+                    )
+                    self._ref_sets[(table, column)] = referenced_column_contents
                 # Check if any of the actual values are not in the referenced column
-                # Convert the values to strings for comparison
-                bad_references = [value for value in column_contents if str(value) not in referenced_column_contents]
+                bad_references = [value for value in column_strings if value not in referenced_column_contents]
                 if bad_references:
                     flagged = True
                     flag_notes = "Column contains values not in referenced column"
@@ -316,143 +504,158 @@ class CompareExpectedToActual:
 
     def _validate_column(
             self,
-            column_name: str,
             expected_info: dict,
             actual_column_info: dict,
-            table_contents: list[Any]
+            column_contents: list[Any]
     ) -> Tuple[bool, str, int, int]:
-        required_flagged, required_notes = self._check_required(
+        # Collect flags and notes as each check runs, keeping notes in the order the checks are made
+        flag_notes = []
+        flagged, notes = self._check_required(
             required=expected_info.get('required'),
             null_fields=actual_column_info['empty_cells'],
         )
+        if notes:
+            flag_notes.append(notes)
 
-        multiple_values_allowed_flagged, multiple_values_allowed_notes = self._compare_values(
+        check_flagged, notes = self._compare_values(
             expected=expected_info.get('multiple_values_allowed'),
             actual=actual_column_info['inferred_multiple_values_allowed'],
             column='multiple_values_allowed'
         )
+        flagged |= check_flagged
+        if notes:
+            flag_notes.append(notes)
 
-        primary_key_flagged, primary_key_notes = self._compare_values(
+        check_flagged, notes = self._compare_values(
             expected=expected_info.get('primary_key'),
             actual=actual_column_info['primary_key'],
             column='primary_key'
         )
+        flagged |= check_flagged
+        if notes:
+            flag_notes.append(notes)
 
-        data_type_flagged, data_type_notes = self._compare_values(
+        check_flagged, notes = self._compare_values(
             # Convert the expected data type to the inferred data type
             expected=expected_info.get('data_type'),
             actual=actual_column_info['inferred_data_type'],
             column='data_type'
         )
+        flagged |= check_flagged
+        if notes:
+            flag_notes.append(notes)
 
+        value_not_in_ref_col_count = 0
+        non_allowed_value_count = 0
         if expected_info.get('allowed_values_list') or expected_info.get('allowed_values_pattern') or \
                 expected_info.get('refers_to_column'):
-            # Only get column contents if need to check allowed values or referenced column
-            column_contents = [row[column_name] for row in table_contents if column_name in row]
+            # The pattern and referenced column checks both compare values as strings, so convert each
+            # value (lists included) once and share the result
+            if expected_info.get('allowed_values_pattern') or expected_info.get('refers_to_column'):
+                column_strings = [value if isinstance(value, str) else str(value) for value in column_contents]
+            else:
+                column_strings = []
 
-            contents_flagged, content_notes, non_allowed_value_count = self._validate_column_contents(
+            check_flagged, notes, non_allowed_value_count = self._validate_column_contents(
                 expected_info=expected_info,
-                actual_column_info=column_contents
+                actual_column_info=column_contents,
+                column_strings=column_strings
             )
+            flagged |= check_flagged
+            if notes:
+                flag_notes.append(notes)
 
-            refers_to_flagged, refers_to_notes, value_not_in_ref_col_count = self._check_referenced_column(
+            check_flagged, notes, value_not_in_ref_col_count = self._check_referenced_column(
                 refers_to_column=expected_info.get('refers_to_column'),
-                column_contents=column_contents
+                column_strings=column_strings
             )
-        else:
-            contents_flagged = False
-            content_notes = ""
-            refers_to_flagged = False
-            refers_to_notes = ""
-            value_not_in_ref_col_count = 0
-            non_allowed_value_count = 0
-
-        flagged = any(
-            [
-                data_type_flagged, required_flagged, multiple_values_allowed_flagged,
-                primary_key_flagged, contents_flagged, refers_to_flagged
-            ]
-        )
-        flag_notes = [
-            note for note in [
-                required_notes, multiple_values_allowed_notes, primary_key_notes,
-                data_type_notes, content_notes, refers_to_notes
-            ] if note
-        ]
+            flagged |= check_flagged
+            if notes:
+                flag_notes.append(notes)
+
         return flagged, ", ".join(flag_notes), value_not_in_ref_col_count, non_allowed_value_count
 
-    def run(self) -> list[dict]:
-        output_content = []
+    def _create_output_row(self, table: str, column: str, column_info: dict, column_contents: list[Any]) -> tuple:
+        expected_info = self.expected_data.get((table, column))
+        # If the column is not in the expected data, flag it and do not look into the column
+        if not expected_info:
+            return self._create_row_tuple(
+                table=table,
+                column=column,
+                label=NA,
+                description=NA,
+                column_dict=column_info,
+                flagged=True,
+                expected_info={},
+                flag_notes="Column not found in input file",
+                value_not_in_ref_col_count=0,
+                non_allowed_value_count=0
+            )
+        flagged, flag_notes, value_not_in_ref_col_count, non_allowed_value_count = self._validate_column(
+            expected_info=expected_info,
+            actual_column_info=column_info,
+            column_contents=column_contents
+        )
+        return self._create_row_tuple(
+            table=table,
+            column=column,
+            label=expected_info.get('label', NA),
+            description=expected_info.get('description', NA),
+            column_dict=column_info,
+            flagged=flagged,
+            expected_info=expected_info,
+            flag_notes=flag_notes,
+            value_not_in_ref_col_count=value_not_in_ref_col_count,
+            non_allowed_value_count=non_allowed_value_count
+        )
+
+    def run(self) -> Iterator[tuple]:
+        """Yield the output rows one at a time so they can be written as they are created"""
         for table, table_info in self.actual_workspace_info.items():
+            table_columns = table_info['table_columns']
             for column, column_info in table_info['column_info'].items():
-                expected_info = self.expected_data.get((table, column), {})
-                label = expected_info.get('label', NA)
-                description = expected_info.get('description', NA)
-                # If the column is not in the expected data, flag it and do not look into the column
-                if not expected_info:
-                    flagged = True
-                    value_not_in_ref_col_count = 0
-                    non_allowed_value_count = 0
-                    flag_notes = "Column not found in input file"
-                else:
-                    flagged, flag_notes, value_not_in_ref_col_count, non_allowed_value_count = self._validate_column(
-                        column_name=column,
-                        expected_info=expected_info,
-                        actual_column_info=column_info,
-                        table_contents=table_info['table_contents']
-                    )
-                output_content.append(
-                    self._create_row_dict(
-                        table=table,
-                        column=column,
-                        label=label,
-                        description=description,
-                        column_dict=column_info,
-                        flagged=flagged,
-                        expected_info=expected_info,
-                        flag_notes=flag_notes,
-                        value_not_in_ref_col_count=value_not_in_ref_col_count,
-                        non_allowed_value_count=non_allowed_value_count
-                    )
+                yield self._create_output_row(
+                    table=table, column=column, column_info=column_info, column_contents=table_columns[column]
                 )
-        return output_content
+
+
+def create_ordered_header_list(input_headers: list[str]) -> list[str]:
+    """Put the headers from the input file first and in that order, then any required headers not already there"""
+    input_header_set = set(input_headers)
+    return input_headers + [key for key in REQUIRED_OUTPUT_HEADERS if key not in input_header_set]
 
 
 class CreateOutputTsv:
     def __init__(
             self,
             output_file: str,
-            output_content: list[dict],
-            input_headers: list[str] = [],
+            output_content: Iterable[tuple],
+            output_headers: list[str],
             row_order: list[tuple[str, str]] = []
     ):
         self.output_file = output_file
         self.output_content = output_content
-        # If input file is given then get the headers that originally existed to go in front and in that order
-        self.input_headers = input_headers
+        self.output_headers = output_headers
         self.row_order = row_order
+        self.table_name_index = output_headers.index('table_name')
+        self.column_name_index = output_headers.index('column_name')
 
-    def _create_ordered_header_list(self) -> list[str]:
-        all_keys: set[str] = set()
-        for record in self.output_content:
-            all_keys.update(record.keys())
-        # Add any keys that are not already in the output_headers to the end of the list
-        updated_headers = self.input_headers + [key for key in REQUIRED_OUTPUT_HEADERS if key not in self.input_headers]
-        return updated_headers
-
-    def _sort_rows(self, item: dict) -> int:
+    def _sort_rows(self, item: tuple) -> int:
         """Sort the output content based on the order of the input file"""
-        item_tuple = (item['table_name'], item['column_name'])
+        item_tuple = (item[self.table_name_index], item[self.column_name_index])
         # If the tuple is in the order list, return the index of the tuple; otherwise, place it at the end
-        return self.row_order.index(item_tuple) if item_tuple in row_order else len(row_order)
+        return self.row_order.index(item_tuple) if item_tuple in self.row_order else len(self.row_order)
 
     def run(self) -> None:
-        Csv(
-            file_path=self.output_file
-        ).create_tsv_from_list_of_dicts(
-            list_of_dicts=sorted(self.output_content, key=self._sort_rows),
-            header_list=self._create_ordered_header_list()
-        )
+        logging.info(f'Creating {self.output_file}')
+        # Rows only need to be collected when they have to be sorted into the input file order. Otherwise
+        # write each row as it is created
+        rows = sorted(self.output_content, key=self._sort_rows) if self.row_order else self.output_content
+        with open(self.output_file, 'w', newline='') as f:
+            # Keep the same quoting and blank cells that utils.csv_util.Csv produces
+            writer = csv.writer(f, delimiter='\t', quotechar="'")
+            writer.writerow(self.output_headers)
+            writer.writerows(rows)
 
 
 if __name__ == '__main__':
@@ -465,13 +668,9 @@ if __name__ == '__main__':
     if data_dictionary_file:
         data_dict_file_name = os.path.basename(data_dictionary_file).replace(".tsv", "")
         output_file = f"{data_dict_file_name}.summary_stats.{date_string}.tsv"
-        # Get the headers from the input file to keep the order consistent
-        input_headers = Csv(file_path=data_dictionary_file).get_header_order_from_tsv()
-        # Get the contents of the input file to use as the expected data
-        data_dict_contents = Csv(file_path=data_dictionary_file).create_list_of_dicts_from_tsv(
-            expected_headers=INPUT_HEADERS,
-            allow_extra_headers=True
-        )
+        # Get the headers from the input file to keep the order consistent and the contents
+        # of the input file to use as the expected data
+        input_headers, data_dict_contents = read_data_dictionary(data_dictionary_file)
         # Create a list of tuples from input to keep the order consistent later
         row_order = [(row['table_name'], row['column_name']) for row in data_dict_contents]
     else:
@@ -488,20 +687,26 @@ if __name__ == '__main__':
     request_util = RunRequest(token=token)
     terra = TerraWorkspace(request_util=request_util, workspace_name=workspace_name, billing_project=billing_project)
 
-    # Get the tables information and create a dictionary with the table name as the key
-    tables_info = GetTablesInfo(workspace=terra).run()
+    # Get the tables information, including the inferred schema, with the table name as the key
+    schema_cache = None if args.no_schema_cache else SchemaCache()
+    try:
+        tables_info = GetTablesInfo(workspace=terra, schema_cache=schema_cache).run()
+    finally:
+        if schema_cache:
+            schema_cache.close()
 
-    # Add inferred schema information to the table_info dictionary
-    full_tables_info = AddInferredInfo(tables_info=tables_info).run()
+    # Get the output headers up front so each row can be built as a tuple in column order
+    output_headers = create_ordered_header_list(input_headers)
 
     output_content = CompareExpectedToActual(
         expected_data=input_data,
-        actual_workspace_info=full_tables_info
+        actual_workspace_info=tables_info,
+        output_headers=output_headers
     ).run()
 
     CreateOutputTsv(
-        input_headers=input_headers,
         output_file=output_file,
         output_content=output_content,
+        output_headers=output_headers,
         row_order=row_order
     ).run()
@@ -0,0 +1,25 @@
+import pytest
+import os
+
+from python.utils import GCP
+from python.utils.requests_utils.request_util import RunRequest
+from python.utils.token_util import Token
+
+
+# Built by fixtures instead of at import time so collecting these modules does not need credentials, and one token
+# (refreshed by Token when it nears expiry) is shared by every integration test in the session
+@pytest.fixture(scope="session")
+def auth_token():
+    return Token(cloud=GCP)
+
+
+@pytest.fixture(scope="session")
+def request_util(auth_token):
+    return RunRequest(token=auth_token)
+
+
+# Each pytest-xdist worker gets its own suffix for the resources it creates, so workers never delete or recreate each
+# other's. Outside xdist there is no suffix
+@pytest.fixture(scope="session")
+def worker_suffix():
+    return f"-{os.environ['PYTEST_XDIST_WORKER']}" if "PYTEST_XDIST_WORKER" in os.environ else ""
@@ -1,63 +1,160 @@
 import pytest
 import json
 import pathlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 
 from python.utils.gcp_utils import GCPCloudFunctions
 from google.cloud import storage
+from google.cloud.storage.batch import Batch
 from google.auth import default
-
-
-def gcp_test_resource_json():
+from google.api_core.exceptions import GoogleAPICallError
+from requests.adapters import HTTPAdapter
+
+pytestmark = pytest.mark.integration
+
+# Threads used for requests that can't be batched. The client's connection pool is sized to match
+MAX_WORKERS = 32
+# Only the blob names are needed to delete blobs, so skip the rest of the metadata when listing them
+BLOB_NAMES_ONLY = "items(name),nextPageToken"
+# The GCS batch endpoint rejects batch requests holding more than 100 calls
+MAX_BATCH_CALLS = 100
+# Every session's objects are under a prefix starting with this
+TEST_RUN_PREFIX = "testrun-"
+# Objects under a test run prefix older than this were left by a session that never got to its teardown
+STALE_TEST_RUN_AGE = timedelta(days=1)
+
+
+def add_path_prefix(resource, bucket, prefix):
+    """Put every object path in the test resources under the prefix"""
+    if isinstance(resource, dict):
+        return {
+            # Resource paths and validation file paths are given without the bucket
+            key: prefix + value if key in ("path", "file_path") and isinstance(value, str)
+            else add_path_prefix(value, bucket, prefix)
+            for key, value in resource.items()
+        }
+    if isinstance(resource, list):
+        return [add_path_prefix(item, bucket, prefix) for item in resource]
+    if isinstance(resource, str) and resource.startswith(f"gs://{bucket}/"):
+        return resource.replace(f"gs://{bucket}/", f"gs://{bucket}/{prefix}", 1)
+    return resource
+
+
+@pytest.fixture(scope='session')
+def test_prefix(worker_suffix):
+    # Each session (and each pytest-xdist worker) only creates and deletes objects under its own prefix so they
+    # can share the bucket
+    return f"{TEST_RUN_PREFIX}{uuid.uuid4()}{worker_suffix}/"
+
+
+@pytest.fixture(scope='session')
+def gcp_resources(test_prefix):
     resource_json = pathlib.Path(__file__).parent.joinpath("gcp_resources.json")
     json_data = json.loads(resource_json.read_text())
-    return json_data
-
-
-def check_cloud_paths(path_dicts):
-    def gcs_client():
-        credentials, project = default()
-        return storage.Client(credentials=credentials, project=project)
-
-    client = gcs_client()
-    for validation in path_dicts:
-        bucket = client.bucket(validation["path"]["bucket"])
-        blob = bucket.blob(validation["path"]["file_path"])
-        check_passed = blob.exists() == validation["should_exist"]
-        validation["check_passed"] = check_passed
+    return add_path_prefix(json_data, json_data["bucket"], test_prefix)
+
+
+@pytest.fixture(scope='session')
+def gcp_funcs():
+    return GCPCloudFunctions()
+
+
+@pytest.fixture(scope='session')
+def gcs_client():
+    credentials, project = default()
+    client = storage.Client(credentials=credentials, project=project)
+    # One client is shared by every test and thread, so keep enough pooled connections for all the threads
+    # instead of requests' default of 10
+    client._http.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+    return client
+
+
+def get_validation_blob(client, validation):
+    return client.bucket(validation["path"]["bucket"]).blob(validation["path"]["file_path"])
+
+
+class ResponsesBatch(Batch):
+    """A batch that keeps the sub-responses finish() returns, since leaving the with block discards them"""
+
+    def finish(self, raise_exception=True):
+        self.responses = super().finish(raise_exception=raise_exception)
+        return self.responses
+
+
+def check_cloud_paths(path_dicts, client):
+    if not path_dicts:
+        return
+    blobs = [get_validation_blob(client, validation) for validation in path_dicts]
+    try:
+        # Fetch the metadata for the paths in batch requests instead of one request per path. Errors are kept as
+        # the responses instead of raised, so each path's status can be checked below
+        statuses = []
+        for start in range(0, len(blobs), MAX_BATCH_CALLS):
+            batch = ResponsesBatch(client, raise_exception=False)
+            with batch:
+                for blob in blobs[start:start + MAX_BATCH_CALLS]:
+                    blob.reload(projection="noAcl")
+            # The sub-responses are in the same order as the requests
+            statuses.extend(response.status_code for response in batch.responses)
+    except GoogleAPICallError:
+        # The batch request itself failed (e.g. a BadRequest when GCS rejects the whole batch) so check each path
+        # in parallel instead. exists() only returns False for a missing blob and raises for any other error
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(path_dicts))) as executor:
+            paths_exist = list(
+                executor.map(lambda validation: get_validation_blob(client, validation).exists(), path_dicts)
+            )
+    else:
+        # Only a 404 means the blob is missing. Any other error (e.g. a 403 or 500) says nothing about whether the
+        # blob exists, so fail rather than let a should_exist=False check pass
+        errors = [
+            f"{validation['path']['file_path']}: {status}"
+            for validation, status in zip(path_dicts, statuses)
+            if status != 404 and not 200 <= status < 300
+        ]
+        if errors:
+            raise Exception(f"Could not check if paths exist: {errors}")
+        paths_exist = [status != 404 for status in statuses]
+    for validation, path_exists in zip(path_dicts, paths_exist):
+        validation["check_passed"] = path_exists == validation["should_exist"]
 
 
 @pytest.fixture(scope='session', autouse=True)
-def setup_test_gcs_resources():
-
-    def gcp_test_resource_json():
-        resource_json = pathlib.Path(__file__).parent.joinpath("gcp_resources.json")
-        json_data = json.loads(resource_json.read_text())
-        return json_data
+def setup_test_gcs_resources(gcp_resources, gcs_client, test_prefix):
 
-    def gcs_client():
-        credentials, project = default()
-        return storage.Client(credentials=credentials, project=project)
-
-    def del_bucket_objs(obj_list):
-        for item in obj_list:
-            item.delete()
+    def del_bucket_objs(obj_list, raise_exception=True):
+        blobs = list(obj_list)
+        # Send the deletes as batch requests, each holding up to the GCS limit of MAX_BATCH_CALLS deletes
+        for start in range(0, len(blobs), MAX_BATCH_CALLS):
+            with gcs_client.batch(raise_exception=raise_exception):
+                test_bucket.delete_blobs(blobs[start:start + MAX_BATCH_CALLS])
 
+    # Uploads can't be batched and each one is its own blocking request so run them in parallel
     def create_cloud_files():
 
-        bucket = client.bucket(json_data["bucket"])
-        for test, test_info in json_data["tests"].items():
-            for item in test_info['resources']:
-                blob = bucket.blob(item['path'])
-                blob.upload_from_string(item['data'])
+        bucket = gcs_client.bucket(gcp_resources["bucket"])
+        uploads = [
+            (bucket.blob(item['path']), item['data'])
+            for test_info in gcp_resources["tests"].values()
+            for item in test_info['resources']
+        ]
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list(executor.map(lambda upload: upload[0].upload_from_string(upload[1]), uploads))
 
     # Setup resources
-    client = gcs_client()
-    json_data = gcp_test_resource_json()
-    test_bucket = client.bucket(json_data["bucket"])
-    # cleanup bucket if any left-over objects are present before creating new ones
-    blob_list = test_bucket.list_blobs()
-    if blob_list.num_results > 0:
-        del_bucket_objs(obj_list=blob_list)
+    test_bucket = gcs_client.bucket(gcp_resources["bucket"])
+
+    # Clean up objects left by earlier sessions that crashed or were interrupted. Other sessions may be using the
+    # bucket right now, so only objects old enough that their session can't still be running are deleted. Other
+    # sessions may be cleaning up the same objects, so errors (e.g. an object already deleted) don't fail the setup
+    stale_before = datetime.now(timezone.utc) - STALE_TEST_RUN_AGE
+    stale_blobs = [
+        blob for blob in test_bucket.list_blobs(prefix=TEST_RUN_PREFIX, fields="items(name,timeCreated),nextPageToken")
+        if blob.time_created < stale_before
+    ]
+    del_bucket_objs(stale_blobs, raise_exception=False)
 
     # create test objects
     create_cloud_files()
@@ -65,12 +162,23 @@ def setup_test_gcs_resources():
     yield
 
     # teardown resources
-    blob_list = test_bucket.list_blobs()
+    blob_list = test_bucket.list_blobs(prefix=test_prefix, fields=BLOB_NAMES_ONLY)
     del_bucket_objs(blob_list)
 
 
-def test_list_bucket_contents():
-    resources = gcp_test_resource_json()['tests']
+# Autouse so the bucket is listed once, straight after the test files are created and before any test changes them
+@pytest.fixture(scope='session', autouse=True)
+def bucket_listing(setup_test_gcs_resources, gcp_resources, gcp_funcs, test_prefix):
+    # Other sessions may have objects in the bucket, so only list this session's objects. The listing includes the
+    # size and md5 of each file, so tests can check file metadata here instead of fetching it one file at a time
+    return {
+        item['path']: item
+        for item in gcp_funcs.list_bucket_contents(bucket_name=gcp_resources["bucket"], prefix=test_prefix)
+    }
+
+
+def test_list_bucket_contents(gcp_resources, bucket_listing):
+    resources = gcp_resources['tests']
     expected_files = []
     gcp_blob_count = 0
     for key, value in resources.items():
@@ -78,11 +186,10 @@ def test_list_bucket_contents():
             expected_files.append(item['path'])
             gcp_blob_count += 1
 
-    result = GCPCloudFunctions().list_bucket_contents(bucket_name=gcp_test_resource_json()["bucket"])
     found_files = [
         # Remove bucket. gs://bucket_name/path/to/file -> path/to/file
-        '/'.join(item['path'].split('/')[3:])
-        for item in result
+        '/'.join(path.split('/')[3:])
+        for path in bucket_listing
     ]
     if len(found_files) > gcp_blob_count:
         extra_files = set(found_files) - set(expected_files)
@@ -95,125 +202,114 @@ def test_list_bucket_contents():
     assert len(found_files) == gcp_blob_count, f"Expected {gcp_blob_count} files, got {len(found_files)}. {message}"
 
 
-def test_get_blob_details():
-    test_data = gcp_test_resource_json()['tests']['get_blob_details']['test_data']
-    result = GCPCloudFunctions().load_blob_from_full_path(full_path=test_data['function_input']['blob_path'])
-    assert result.path == "/b/ops_dev_bucket/o/list_bucket_test%2Fex_file_1.txt"
+def test_get_blob_details(gcp_resources, gcp_funcs, test_prefix, bucket_listing):
+    test_data = gcp_resources['tests']['get_blob_details']['test_data']
+    blob_path = test_data['function_input']['blob_path']
+    # Load the blob's metadata from GCS and check it against the metadata from the bucket listing
+    result = gcp_funcs.load_blob_from_full_path(full_path=blob_path)
+    assert result.path == f"/b/ops_dev_bucket/o/{quote(test_prefix, safe='')}list_bucket_test%2Fex_file_1.txt"
+    assert result.size == bucket_listing[blob_path]['size_in_bytes'], "Blob size did not match the bucket listing"
+    assert result.md5_hash == bucket_listing[blob_path]['md5_hash'], "Blob md5 did not match the bucket listing"
 
 
-def test_copy_cloud_file():
-    test_data = gcp_test_resource_json()['tests']['copy_file']['test_data']
-    validations = test_data['validation']
+def run_copy_cloud_file(gcp_funcs, function_input):
+    gcp_funcs.copy_cloud_file(
+        src_cloud_path=function_input['source_path'], full_destination_path=function_input['destination_path'])
 
-    GCPCloudFunctions().copy_cloud_file(
-        src_cloud_path=test_data['function_input']['source_path'],
-        full_destination_path=test_data['function_input']['destination_path'])
-    check_cloud_paths(validations)
-    for item in validations:
-        assert item["check_passed"], "Files were not in expected end state"
 
+def run_delete_cloud_file(gcp_funcs, function_input):
+    gcp_funcs.delete_cloud_file(full_cloud_path=function_input['deletion_path'])
 
-def test_delete_cloud_file():
-    test_data = gcp_test_resource_json()['tests']['delete_file']['test_data']
-    validations = test_data['validation']
 
-    GCPCloudFunctions().delete_cloud_file(full_cloud_path=test_data['function_input']['deletion_path'])
-    check_cloud_paths(validations)
-    for item in validations:
-        assert item["check_passed"], "Files were not in expected end state"
+def run_move_cloud_file(gcp_funcs, function_input):
+    gcp_funcs.move_cloud_file(
+        src_cloud_path=function_input['source_path'], full_destination_path=function_input['destination_path'])
 
 
-def test_move_cloud_file():
-    test_data = gcp_test_resource_json()['tests']['move_file']['test_data']
-    validations = test_data['validation']
+def run_delete_multiple_files(gcp_funcs, function_input):
+    gcp_funcs.delete_multiple_files(files_to_delete=function_input['files_to_delete'])
 
-    GCPCloudFunctions().move_cloud_file(
-        src_cloud_path=test_data['function_input']['source_path'],
-        full_destination_path=test_data['function_input']['destination_path'])
-    check_cloud_paths(validations)
-    for item in validations:
-        assert item["check_passed"], "Files were not in expected end state"
 
+def run_multithread_copy_of_files_with_validation(gcp_funcs, function_input):
+    gcp_funcs.multithread_copy_of_files_with_validation(files_to_copy=function_input, workers=2, max_retries=1)
 
-def test_get_filesize():
-    test_data = gcp_test_resource_json()['tests']['get_filesize']['test_data']
-
-    filesize = GCPCloudFunctions().get_filesize(target_path=test_data['function_input']['source_path'])
-    assert filesize == 30, "Filesize was not as expected"
 
-
-def test_validate_files_are_same():
-    test_data = gcp_test_resource_json()['tests']['validate_files_are_same']['test_data']
-
-    files_match = GCPCloudFunctions().validate_files_are_same(
-        src_cloud_path=test_data['function_input']['file_1'], dest_cloud_path=test_data['function_input']['file_1'])
-    files_do_not_match = GCPCloudFunctions().validate_files_are_same(
-        src_cloud_path=test_data['function_input']['file_1'], dest_cloud_path=test_data['function_input']['file_2'])
-    assert files_match and not files_do_not_match, "File validations did not return expected results"
+def assert_cloud_paths(validations, client):
+    check_cloud_paths(validations, client)
+    failed = [item["path"]["file_path"] for item in validations if not item["check_passed"]]
+    assert not failed, f"Files were not in expected end state: {failed}"
 
 
-def test_delete_multiple_files():
-    test_data = gcp_test_resource_json()['tests']['delete_multiple_files']['test_data']
-    validations = test_data['validation']
+# Each operation only touches its own test's resources, so the cases can run in any order
+@pytest.mark.parametrize(
+    "test_name, run_operation",
+    [
+        pytest.param("copy_file", run_copy_cloud_file, id="copy_cloud_file"),
+        pytest.param("delete_file", run_delete_cloud_file, id="delete_cloud_file"),
+        pytest.param("move_file", run_move_cloud_file, id="move_cloud_file"),
+        pytest.param("delete_multiple_files", run_delete_multiple_files, id="delete_multiple_files"),
+        pytest.param(
+            "multithread_copy_of_files_with_validation", run_multithread_copy_of_files_with_validation,
+            id="multithread_copy_of_files_with_validation"
+        ),
+    ]
+)
+def test_cloud_file_operation(gcp_resources, gcs_client, gcp_funcs, test_name, run_operation):
+    test_data = gcp_resources['tests'][test_name]['test_data']
 
-    GCPCloudFunctions().delete_multiple_files(files_to_delete=test_data['function_input']['files_to_delete'])
-    check_cloud_paths(validations)
-    for item in validations:
-        assert item["check_passed"], "Files were not in expected end state"
+    run_operation(gcp_funcs, test_data['function_input'])
+    assert_cloud_paths(test_data['validation'], gcs_client)
 
 
-def test_validate_file_pair():
-    test_data = gcp_test_resource_json()['tests']['validate_file_pair']['test_data']
+def test_move_or_copy_multiple_files(gcp_resources, gcs_client, gcp_funcs):
+    # The move uses the same source files as the copy, so both run in one test with the copy first
+    test_data = gcp_resources['tests']['move_or_copy_multiple_files']['test_data']
 
-    files_match = GCPCloudFunctions().validate_file_pair(
-        source_file=test_data['function_input']['file_1'], full_destination_path=test_data['function_input']['file_1'])
+    gcp_funcs.move_or_copy_multiple_files(
+        files_to_move=test_data['function_input']['copy_test_input'], action="copy", workers=2, max_retries=1)
+    assert_cloud_paths(test_data['validation']['copy_test'], gcs_client)
 
-    files_do_not_match = GCPCloudFunctions().validate_file_pair(
-        source_file=test_data['function_input']['file_1'], full_destination_path=test_data['function_input']['file_2'])
+    gcp_funcs.move_or_copy_multiple_files(
+        files_to_move=test_data['function_input']['move_test_input'], action="move", workers=2, max_retries=1)
+    assert_cloud_paths(test_data['validation']['move_test'], gcs_client)
 
-    assert files_match['identical'] and not files_do_not_match['identical'], \
-        "File validations did not return expected results"
 
+def test_get_filesize(gcp_resources, gcp_funcs, bucket_listing):
+    test_data = gcp_resources['tests']['get_filesize']['test_data']
+    source_path = test_data['function_input']['source_path']
 
-def test_loop_and_log_validation_files_multithreaded():
-    test_data = gcp_test_resource_json()['tests']['loop_and_log_validation_files_multithreaded']['test_data']
+    filesize = gcp_funcs.get_filesize(target_path=source_path)
+    assert filesize == 30, "Filesize was not as expected"
+    assert filesize == bucket_listing[source_path]['size_in_bytes'], "Filesize did not match the bucket listing"
 
-    result = GCPCloudFunctions().loop_and_log_validation_files_multithreaded(
-        files_to_validate=test_data['function_input']['input_list'], log_difference=True)
 
-    assert len(result) == 1, "Expected one file to be different, got more or less"
+def test_validate_files_are_same(gcp_resources, gcp_funcs):
+    test_data = gcp_resources['tests']['validate_files_are_same']['test_data']
 
+    files_match = gcp_funcs.validate_files_are_same(
+        src_cloud_path=test_data['function_input']['file_1'], dest_cloud_path=test_data['function_input']['file_1'])
+    files_do_not_match = gcp_funcs.validate_files_are_same(
+        src_cloud_path=test_data['function_input']['file_1'], dest_cloud_path=test_data['function_input']['file_2'])
+    assert files_match and not files_do_not_match, "File validations did not return expected results"
 
-def test_multithread_copy_of_files_with_validation():
-    test_data = gcp_test_resource_json()['tests']['multithread_copy_of_files_with_validation']['test_data']
-    validation = test_data['validation']
 
-    GCPCloudFunctions().multithread_copy_of_files_with_validation(
-        files_to_copy=test_data['function_input'], workers=2, max_retries=1)
-    check_cloud_paths(validation)
-    for item in validation:
-        assert item["check_passed"], "Files were not in expected end state"
+def test_validate_file_pair(gcp_resources, gcp_funcs):
+    test_data = gcp_resources['tests']['validate_file_pair']['test_data']
 
+    files_match = gcp_funcs.validate_file_pair(
+        source_file=test_data['function_input']['file_1'], full_destination_path=test_data['function_input']['file_1'])
 
-def test_move_or_copy_multiple_files():
-    test_data = gcp_test_resource_json()['tests']['move_or_copy_multiple_files']['test_data']
-    validation = test_data['validation']
+    files_do_not_match = gcp_funcs.validate_file_pair(
+        source_file=test_data['function_input']['file_1'], full_destination_path=test_data['function_input']['file_2'])
 
-    def run_copy_test():
+    assert files_match['identical'] and not files_do_not_match['identical'], \
+        "File validations did not return expected results"
 
-        GCPCloudFunctions().move_or_copy_multiple_files(
-            files_to_move=test_data['function_input']['copy_test_input'], action="copy", workers=2, max_retries=1)
-        check_cloud_paths(validation['copy_test'])
-        for item in validation['copy_test']:
-            assert item["check_passed"], "Files were not in expected end state"
 
-    def run_mv_test():
+def test_loop_and_log_validation_files_multithreaded(gcp_resources, gcp_funcs):
+    test_data = gcp_resources['tests']['loop_and_log_validation_files_multithreaded']['test_data']
 
-        GCPCloudFunctions().move_or_copy_multiple_files(
-            files_to_move=test_data['function_input']['move_test_input'], action="move", workers=2, max_retries=1)
-        check_cloud_paths(validation['move_test'])
-        for item in validation['move_test']:
-            assert item["check_passed"], "Files were not in expected end state"
+    result = gcp_funcs.loop_and_log_validation_files_multithreaded(
+        files_to_validate=test_data['function_input']['input_list'], log_difference=True)
 
-    run_copy_test()
-    run_mv_test()
+    assert len(result) == 1, "Expected one file to be different, got more or less"
@@ -0,0 +1,51 @@
+import pytest
+import re
+
+from python.utils.terra_utils.terra_util import TerraGroups, MEMBER
+
+pytestmark = pytest.mark.integration
+
+INTEGRATION_TEST_GROUP_NAME = "ops-integration-test-group"
+
+
+@pytest.fixture(scope="session")
+def group_name(worker_suffix):
+    return f"{INTEGRATION_TEST_GROUP_NAME}{worker_suffix}"
+
+
+@pytest.fixture(scope="session")
+def terra_groups(request_util):
+    return TerraGroups(request_util=request_util)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_terra_groups(terra_groups, group_name):
+    # Delete the existing group before starting any tests
+    terra_groups.delete_group(group_name=group_name)
+
+    # Run tests
+    yield
+
+
+def test_create_group(terra_groups, group_name):
+    res = terra_groups.create_group(group_name=group_name)
+    assert res == 201
+
+
+def test_add_user_to_group(terra_groups, group_name):
+    res = terra_groups.add_user_to_group(
+        group=group_name, email="test@broadinstitute.org", role=MEMBER,
+    )
+    assert res == 204
+
+
+def test_remove_user_from_group(terra_groups, group_name):
+    res = terra_groups.remove_user_from_group(
+        group=group_name, email="test@broadinstitute.org", role=MEMBER
+    )
+    assert res == 204
+
+
+def test_check_role(terra_groups):
+    with pytest.raises(ValueError, match=re.escape(f"Role must be one of {terra_groups.GROUP_MEMBERSHIP_OPTIONS}")):
+        terra_groups._check_role(role="members")
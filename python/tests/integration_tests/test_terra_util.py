@@ -1,39 +1,35 @@
 import pytest
-import requests
 import os
-import re
 
-from python.utils import GCP
-from python.utils.requests_utils.request_util import RunRequest
-from python.utils.terra_utils.terra_util import TerraWorkspace, TerraGroups, MEMBER
+from python.utils.terra_utils.terra_util import TerraWorkspace
 from python.utils.terra_utils.terra_workflow_configs import WorkflowConfigs
-from python.utils.token_util import Token
 
+pytestmark = pytest.mark.integration
 
 INTEGRATION_TEST_TERRA_BILLING_PROJECT = "ops-integration-billing"
 INTEGRATION_TEST_TERRA_WORKSPACE_NAME = "ops-integration-test-workspace"
-INTEGRATION_TEST_GROUP_NAME = "ops-integration-test-group"
 
-auth_token = Token(cloud=GCP)
-request_util = RunRequest(token=auth_token)
-terra_workspace = TerraWorkspace(
-    billing_project=INTEGRATION_TEST_TERRA_BILLING_PROJECT,
-    workspace_name=INTEGRATION_TEST_TERRA_WORKSPACE_NAME,
-    request_util=request_util
-)
-terra_groups = TerraGroups(request_util=request_util)
+
+@pytest.fixture(scope="session")
+def workspace_name(worker_suffix):
+    return f"{INTEGRATION_TEST_TERRA_WORKSPACE_NAME}{worker_suffix}"
+
+
+@pytest.fixture(scope="session")
+def terra_workspace(request_util, workspace_name):
+    return TerraWorkspace(
+        billing_project=INTEGRATION_TEST_TERRA_BILLING_PROJECT,
+        workspace_name=workspace_name,
+        request_util=request_util
+    )
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_terra_resources():
-    # Attempt to delete the test workspace before starting any tests
-    try:
+def setup_test_terra_resources(terra_workspace):
+    # Only delete the test workspace if an earlier run left it behind. Deleting a workspace that does not exist
+    # fails, and the request is retried with backoff before the error is raised
+    if terra_workspace.get_workspace_info(continue_not_found=True):
         terra_workspace.delete_workspace()
-    except requests.exceptions.HTTPError:
-        pass
-
-    # Delete the existing group before starting any tests
-    terra_groups.delete_group(group_name=INTEGRATION_TEST_GROUP_NAME)
 
     # Create the test workspace
     terra_workspace.create_workspace(continue_if_exists=False)
@@ -41,8 +37,11 @@ def setup_test_terra_resources():
     # Run tests
     yield
 
+    # Delete the test workspace so the next run starts without one
+    terra_workspace.delete_workspace()
+
 
-def test_get_workspace_acl():
+def test_get_workspace_acl(terra_workspace):
     res = terra_workspace.get_workspace_acl()
     for _, perms in res["acl"].items():
         assert perms["accessLevel"] == "OWNER"
@@ -50,7 +49,7 @@ def test_get_workspace_acl():
         assert perms["canShare"] is True
 
 
-def test_get_workspace_info():
+def test_get_workspace_info(terra_workspace, workspace_name):
     bucket = terra_workspace.get_workspace_bucket()
     res = terra_workspace.get_workspace_info()
     assert res["workspace"]["attributes"] == {}
@@ -58,13 +57,13 @@ def test_get_workspace_info():
     assert res["workspace"]["billingAccount"] == "billingAccounts/01E530-84B082-ED5441"
     assert res["workspace"]["bucketName"] == bucket
     assert res["workspace"]["cloudPlatform"] == "Gcp"
-    assert res["workspace"]["name"] == INTEGRATION_TEST_TERRA_WORKSPACE_NAME
+    assert res["workspace"]["name"] == workspace_name
     assert res["workspace"]["namespace"] == INTEGRATION_TEST_TERRA_BILLING_PROJECT
     assert res["canShare"] is True
     assert res["canCompute"] is True
 
 
-def test_update_user_acl():
+def test_update_user_acl(terra_workspace):
     access_level = "READER"
     email = "test@broadinstitute.org"
     res = terra_workspace.update_user_acl(
@@ -78,19 +77,19 @@ def test_update_user_acl():
     assert res["usersUpdated"][0]["email"] == email
 
 
-def test_put_metadata_for_library_dataset():
+def test_put_metadata_for_library_dataset(terra_workspace, workspace_name):
     bucket = terra_workspace.get_workspace_bucket()
     library_metadata = {"library:dulvn": 1}
     res = terra_workspace.put_metadata_for_library_dataset(library_metadata=library_metadata)
     assert res["namespace"] == INTEGRATION_TEST_TERRA_BILLING_PROJECT
-    assert res["name"] == INTEGRATION_TEST_TERRA_WORKSPACE_NAME
+    assert res["name"] == workspace_name
     assert res["bucketName"] == bucket
     assert res["attributes"] == library_metadata
-    assert res["name"] == INTEGRATION_TEST_TERRA_WORKSPACE_NAME
+    assert res["name"] == workspace_name
     assert res["namespace"] == INTEGRATION_TEST_TERRA_BILLING_PROJECT
 
 
-def test_update_multiple_users_acl():
+def test_update_multiple_users_acl(terra_workspace):
     acl_list = [
         {
             "email": "test2@broadinstitute.org",
@@ -119,24 +118,24 @@ def test_update_multiple_users_acl():
             assert invite["canShare"] is True
 
 
-def test_create_workspace_attributes_ingest_dict():
+def test_create_workspace_attributes_ingest_dict(terra_workspace):
     res = terra_workspace.create_workspace_attributes_ingest_dict()
     assert res == [{"attribute": "library:dulvn", "value": "1"}]
 
 
-def test_upload_metadata_to_workspace_table():
+def test_upload_metadata_to_workspace_table(terra_workspace):
     current_dir = os.path.dirname(__file__)
     file_path = os.path.join(current_dir, "sample.tsv")
     res = terra_workspace.upload_metadata_to_workspace_table(entities_tsv=file_path)
     assert res == "sample"
 
 
-def test_get_workspace_workflows():
+def test_get_workspace_workflows(terra_workspace):
     res = terra_workspace.get_workspace_workflows()
     assert res == []
 
 
-def test_import_workflow():
+def test_import_workflow(terra_workspace):
     workflow_name = "ExportDataFromSnapshotToOutputBucket"
     status_code = WorkflowConfigs(
         workflow_name=workflow_name,
@@ -146,37 +145,13 @@ def test_import_workflow():
     assert status_code == 201
 
 
-def test_get_gcp_workspace_metrics():
+def test_get_gcp_workspace_metrics(terra_workspace):
     res = terra_workspace.get_gcp_workspace_metrics(entity_type="sample")
     expected_res = [{"attributes": {"sample_alias": "ABC"}, "entityType": "sample", "name": "RP-123_ABC"}]
     assert res == expected_res
 
 
-def test_get_workspace_entity_info():
+def test_get_workspace_entity_info(terra_workspace):
     res = terra_workspace.get_workspace_entity_info()
     expected_res = {"sample": {"attributeNames": ["sample_alias"], "count": 1, "idName": "sample_id"}}
     assert res == expected_res
-
-
-def test_create_group():
-    res = terra_groups.create_group(group_name=INTEGRATION_TEST_GROUP_NAME)
-    assert res == 201
-
-
-def test_add_user_to_group():
-    res = terra_groups.add_user_to_group(
-        group=INTEGRATION_TEST_GROUP_NAME, email="test@broadinstitute.org", role=MEMBER,
-    )
-    assert res == 204
-
-
-def test_remove_user_from_group():
-    res = terra_groups.remove_user_from_group(
-        group=INTEGRATION_TEST_GROUP_NAME, email="test@broadinstitute.org", role=MEMBER
-    )
-    assert res == 204
-
-
-def test_check_role():
-    with pytest.raises(ValueError, match=re.escape(f"Role must be one of {terra_groups.GROUP_MEMBERSHIP_OPTIONS}")):
-        terra_groups._check_role(role="members")
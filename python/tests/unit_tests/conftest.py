@@ -0,0 +1,27 @@
+import pytest
+import json
+import pathlib
+
+from python.utils.tdr_utils.tdr_api_utils import TDR
+from python.utils.token_util import Token
+from python.utils.requests_utils.request_util import RunRequest
+
+
+# The resources are only read by the tests, so parse the file once for the whole session
+@pytest.fixture(scope="session")
+def tdr_test_resource_json():
+    resource_json = pathlib.Path(__file__).parent.joinpath("tdr_resources.json")
+    json_data = json.loads(resource_json.read_bytes())
+    return json_data
+
+
+@pytest.fixture(scope="session")
+def request_client():
+    token = Token(cloud='gcp')
+    return RunRequest(token, max_retries=1, max_backoff_time=1)
+
+
+# TDR caches dataset lookups, so each test gets a new instance that shares the session's request client
+@pytest.fixture()
+def tdr_client(request_client):
+    return TDR(request_util=request_client)
@@ -0,0 +1,134 @@
+import pytest
+import json
+import responses
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import urlsplit, parse_qsl
+from unittest.mock import MagicMock
+from requests import HTTPError
+
+from python.utils.requests_utils.request_util import RunRequest
+
+
+"""The instance of the Token class here is mocked, so we can simply test the functionality of the interaction
+with URLs and that expected response codes are getting returned. Requests are answered in process by the responses
+library, which echoes them back the same way httpbin (https://httpbin.org) does for its endpoints."""
+
+base_url = "https://httpbin.org"
+
+
+def echo_request(request):
+    """Return the query parameters, form data and files sent in the request, like httpbin does"""
+    body = request.body or ""
+    if isinstance(body, str):
+        body = body.encode()
+    content_type = request.headers.get("Content-Type", "")
+    form, files = {}, {}
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        files = {
+            part.get_param("name", header="content-disposition"): part.get_payload(decode=True).decode()
+            for part in message.iter_parts()
+        }
+    elif body:
+        form = dict(parse_qsl(body.decode()))
+    res_json = {"args": dict(parse_qsl(urlsplit(request.url).query)), "form": form, "files": files}
+    return 200, {}, json.dumps(res_json)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_httpbin():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add_callback(responses.GET, f"{base_url}/get", callback=echo_request, content_type="application/json")
+        for method in [responses.POST, responses.PATCH, responses.PUT, responses.DELETE]:
+            rsps.add_callback(
+                method, f"{base_url}/{method.lower()}", callback=echo_request, content_type="application/json"
+            )
+        rsps.add(responses.PUT, f"{base_url}/status/500", status=500)
+        yield rsps
+
+
+@pytest.fixture(scope="session")
+def mock_token():
+    return MagicMock()
+
+
+@pytest.fixture(scope="session")
+def request_util(mock_token):
+    return RunRequest(token=mock_token, max_retries=1, max_backoff_time=1)
+
+
+def test_create_headers(request_util, mock_token):
+    headers = request_util.create_headers()
+    expected_res = {
+        "Authorization": f"Bearer {mock_token.token_string}",
+        "accept": "application/json"
+    }
+    assert headers == expected_res
+
+
+def test_create_headers_content_type(request_util, mock_token):
+    headers = request_util.create_headers(content_type="text/tab-separated-values")
+    expected_res = {
+        "Authorization": f"Bearer {mock_token.token_string}",
+        "accept": "application/json",
+        "Content-Type": "text/tab-separated-values",
+    }
+    assert headers == expected_res
+
+
+def test_run_request_get(request_util):
+    param = {"foo": "bar"}
+    response = request_util.run_request(
+        uri=f"{base_url}/get",
+        method="GET",
+        params=param,
+    )
+    assert response.json()["args"] == param
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH", "PUT"])
+def test_run_request_with_data(request_util, method):
+    payload = {"foo": "bar"}
+    response = request_util.run_request(
+        uri=f"{base_url}/{method.lower()}",
+        method=method,
+        data=payload,
+    )
+    assert response.json()["form"] == payload
+    assert response.status_code == 200
+
+
+def test_run_request_delete(request_util):
+    response = request_util.run_request(
+        uri=f"{base_url}/delete",
+        method="DELETE",
+    )
+    assert response.status_code == 200
+
+
+def test_run_request_unsupported_method(request_util):
+    with pytest.raises(ValueError, match="Method PLURT is not supported"):
+        request_util.run_request(
+            uri=f"{base_url}/plurt",
+            method="PLURT",
+        )
+
+
+def test_run_request_bad_response_code(request_util):
+    with pytest.raises(HTTPError):
+        request_util.run_request(
+            uri=f"{base_url}/status/{500}",
+            method="PUT",
+        )
+
+
+def test_upload_file(request_util):
+    file_name = "some_file.tsv"
+    response = request_util.upload_file(
+        uri=f"{base_url}/post",
+        data={"file": file_name},
+    )
+    res_json = json.loads(response)
+    assert res_json["files"]["file"] == file_name
@@ -1,65 +1,37 @@
 import pytest
 import json
-import pathlib
 import responses
 from responses import matchers
+from unittest.mock import patch
 
-from python.utils.tdr_utils.tdr_api_utils import TDR
 from python.utils.tdr_utils.tdr_schema_utils import InferTDRSchema
 from python.utils.tdr_utils.tdr_ingest_utils import BatchIngest
-from python.utils.token_util import Token
-from python.utils.requests_utils.request_util import RunRequest
+from python.utils.tdr_utils.tdr_job_utils import MonitorTDRJob
 
 
 def mock_api_response(test_json):
-    match test_json['method']:
-        case 'GET':
-            responses.get(
-                url=test_json['url'],
-                body=json.dumps(test_json['response']),
-                status=test_json['status'],
-                content_type='application/json',
-                match=[matchers.query_param_matcher(test_json['params'], strict_match=False)]
-            )
-
-        case 'POST':
-            responses.post(
-                url=test_json['url'],
-                body=json.dumps(test_json['response']),
-                status=test_json['status'],
-                content_type='application/json'
-            )
-
-        case 'DELETE':
-            responses.delete(
-                url=test_json['url'],
-                body=json.dumps(test_json['response']),
-                status=test_json['status'],
-                content_type='application/json'
-            )
-
-
-@pytest.fixture()
-def tdr_test_resource_json():
-    resource_json = pathlib.Path(__file__).parent.joinpath("tdr_resources.json")
-    json_data = json.loads(resource_json.read_text())
-    return json_data
-
-
-@pytest.fixture()
-def tdr_client():
-    token = Token(cloud='gcp')
-    requestclient = RunRequest(token, max_retries=1, max_backoff_time=1)
-    return TDR(request_util=requestclient)
+    # GET mocks also have to match the query parameters, since paged endpoints share a URL
+    match = [matchers.query_param_matcher(test_json['params'], strict_match=False)] \
+        if test_json['method'] == 'GET' else []
+    responses.add(
+        method=test_json['method'],
+        url=test_json['url'],
+        body=json.dumps(test_json['response']),
+        status=test_json['status'],
+        content_type='application/json',
+        match=match
+    )
+
+
+# Every test here is in a class, so give each test instance the TDR client and test resources to use
+@pytest.fixture(autouse=True)
+def _get_tdr_client(request, tdr_client, tdr_test_resource_json):
+    request.instance.tdr_client = tdr_client
+    request.instance.test_info = tdr_test_resource_json
 
 
 class TestGetUtils:
 
-    @pytest.fixture(autouse=True)
-    def _get_tdr_client(self, tdr_client, tdr_test_resource_json):
-        self.tdr_client = tdr_client
-        self.test_info = tdr_test_resource_json
-
     @responses.activate
     def test_get_data_set_files(self):
         test_data = self.test_info['tests']['get_files_endpoint']
@@ -68,6 +40,17 @@ class TestGetUtils:
         file_list = self.tdr_client.get_data_set_files(dataset_id=test_data['function_input'])
         assert len(file_list) == 3
 
+    @responses.activate
+    def test_yield_data_set_files(self):
+        test_data = self.test_info['tests']['get_files_endpoint']
+        mock_api_response(test_json=test_data['mock_response']['page_one'])
+        mock_api_response(test_json=test_data['mock_response']['page_two'])
+        files = self.tdr_client.yield_data_set_files(dataset_id=test_data['function_input'])
+        assert next(files)['fileId']
+        # Only the first page is requested until it has been used up
+        assert len(responses.calls) == 1
+        assert len(list(files)) == 2
+
     @responses.activate
     def test_create_file_dict(self):
         test_data = self.test_info['tests']['get_files_endpoint']
@@ -93,6 +76,21 @@ class TestGetUtils:
             billing_profile=test_data['function_input']['billing_profile'])
         assert dataset_exists
 
+    @responses.activate
+    def test_check_if_dataset_exists_cached(self):
+        test_data = self.test_info['tests']['list_datasets_endpoint']
+        mock_api_response(test_json=test_data['mock_response']['page_one'])
+        mock_api_response(test_json=test_data['mock_response']['page_two'])
+        first_lookup = self.tdr_client.check_if_dataset_exists(
+            dataset_name=test_data['function_input']['dataset_name'],
+            billing_profile=test_data['function_input']['billing_profile'])
+        calls_after_first_lookup = len(responses.calls)
+        second_lookup = self.tdr_client.check_if_dataset_exists(
+            dataset_name=test_data['function_input']['dataset_name'],
+            billing_profile=test_data['function_input']['billing_profile'])
+        assert second_lookup == first_lookup
+        assert len(responses.calls) == calls_after_first_lookup
+
     @responses.activate
     def test_get_dataset_info(self):
         test_data = self.test_info['tests']['get_dataset_endpoint']
@@ -149,11 +147,6 @@ class TestGetUtils:
 
 class TestCreateUtils:
 
-    @pytest.fixture(autouse=True)
-    def _get_tdr_client(self, tdr_client, tdr_test_resource_json):
-        self.tdr_client = tdr_client
-        self.test_info = tdr_test_resource_json
-
     @responses.activate
     def test_get_or_create_dataset(self):
         list_dataset_endpoint = self.test_info['tests']['list_datasets_endpoint']
@@ -252,11 +245,6 @@ class TestCreateUtils:
 
 class TestDeleteUtils:
 
-    @pytest.fixture(autouse=True)
-    def _get_tdr_client(self, tdr_client, tdr_test_resource_json):
-        self.tdr_client = tdr_client
-        self.test_info = tdr_test_resource_json
-
     @responses.activate
     def test_delete_files(self):
         test_data = self.test_info['tests']['delete_files_endpoint']
@@ -282,3 +270,19 @@ class TestDeleteUtils:
         mock_api_response(test_data['mock_response']['job_results'])
 
         self.tdr_client.delete_dataset(dataset_id=test_data['function_input']['dataset_guid'])
+
+
+class TestMonitorUtils:
+
+    @responses.activate
+    def test_monitor_job_backoff(self):
+        test_data = self.test_info['tests']['get_job_status']['mock_response']
+        # Responses registered for the same URL are returned in order, so the job runs for six checks then succeeds
+        for _ in range(6):
+            responses.add(method=test_data['method'], url=test_data['url'], status=202,
+                          body=json.dumps({"job_status": "running"}), content_type='application/json')
+        mock_api_response(test_data)
+        with patch("python.utils.tdr_utils.tdr_job_utils.time.sleep") as mock_sleep:
+            MonitorTDRJob(tdr=self.tdr_client, job_id="job_guid", check_interval=3, return_json=False).run()
+        waits = [call.args[0] for call in mock_sleep.call_args_list]
+        assert waits == [1, 1.5, 2.25, 3, 3, 3], f"Waits between job status checks did not back off as expected: {waits}"
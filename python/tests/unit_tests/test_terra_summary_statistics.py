@@ -0,0 +1,213 @@
+import pytest
+import sys
+import pathlib
+from unittest.mock import patch
+
+# The script imports the utils package from the python directory it is run from
+sys.path.insert(0, str(pathlib.Path(__file__).parents[2]))
+import terra_summary_statistics  # noqa: E402
+from terra_summary_statistics import read_data_dictionary, GetTablesInfo, SchemaCache  # noqa: E402
+
+SAMPLE_ROWS = [
+    {"entityType": "sample", "name": "S1", "attributes": {"age": 5, "tissue": "blood"}},
+    {"entityType": "sample", "name": "S2", "attributes": {"age": 7, "tissue": "saliva"}}
+]
+
+
+class FakeWorkspace:
+    """Stands in for TerraWorkspace, returning the given rows for each table"""
+
+    def __init__(self, table_rows):
+        self.table_rows = table_rows
+
+    def get_workspace_entity_info(self):
+        return {
+            table_name: {"idName": f"{table_name}_id", "count": len(rows) if isinstance(rows, list) else 0,
+                         "attributeNames": []}
+            for table_name, rows in self.table_rows.items()
+        }
+
+    def get_gcp_workspace_metrics(self, entity_type):
+        rows = self.table_rows[entity_type]
+        if isinstance(rows, Exception):
+            raise rows
+        return rows
+
+
+@pytest.fixture()
+def schema_cache(tmp_path):
+    cache = SchemaCache(db_path=str(tmp_path.joinpath("cache", "schema.db")))
+    yield cache
+    cache.close()
+
+
+def run_counting_inference(workspace, schema_cache):
+    """Run GetTablesInfo and return the tables info and how many times a schema was inferred"""
+    with patch.object(
+            terra_summary_statistics, "InferTDRSchema", wraps=terra_summary_statistics.InferTDRSchema
+    ) as mock_infer:
+        tables_info = GetTablesInfo(workspace=workspace, schema_cache=schema_cache).run()
+    return tables_info, mock_infer.call_count
+
+
+def write_tsv(tmp_path, lines):
+    tsv_path = tmp_path.joinpath("data_dictionary.tsv")
+    tsv_path.write_text("\n".join(lines) + "\n")
+    return str(tsv_path)
+
+
+def test_read_data_dictionary(tmp_path):
+    tsv_path = write_tsv(tmp_path, ["table_name\tcolumn_name\trequired", "sample\tsample_id\ty", "sample\tage\t"])
+    headers, rows = read_data_dictionary(tsv_path)
+    assert headers == ["table_name", "column_name", "required"]
+    assert rows == [
+        {"table_name": "sample", "column_name": "sample_id", "required": "y"},
+        {"table_name": "sample", "column_name": "age", "required": ""}
+    ]
+
+
+def test_read_data_dictionary_trailing_tab(tmp_path):
+    # Spreadsheet exports often end every data row with a tab. The values must stay under their own headers
+    tsv_path = write_tsv(tmp_path, ["table_name\tcolumn_name\trequired", "sample\tsample_id\ty\t", "sample\tage\tn\t"])
+    headers, rows = read_data_dictionary(tsv_path)
+    assert headers == ["table_name", "column_name", "required"]
+    assert rows == [
+        {"table_name": "sample", "column_name": "sample_id", "required": "y"},
+        {"table_name": "sample", "column_name": "age", "required": "n"}
+    ]
+
+
+def test_read_data_dictionary_extra_and_short_rows(tmp_path):
+    tsv_path = write_tsv(
+        tmp_path, ["table_name\tcolumn_name\trequired", "sample\tsample_id\ty\textra", "sample\tage"]
+    )
+    _, rows = read_data_dictionary(tsv_path)
+    assert rows == [
+        {"table_name": "sample", "column_name": "sample_id", "required": "y"},
+        {"table_name": "sample", "column_name": "age", "required": ""}
+    ]
+
+
+def test_read_data_dictionary_missing_headers(tmp_path):
+    tsv_path = write_tsv(tmp_path, ["table_name\trequired", "sample\ty"])
+    with pytest.raises(ValueError):
+        read_data_dictionary(tsv_path)
+
+
+def test_get_tables_info_failed_table(schema_cache):
+    workspace = FakeWorkspace({
+        "sample": [{"entityType": "sample", "name": "S1", "attributes": {"age": 5}}],
+        "participant": ConnectionError("connection reset")
+    })
+    with pytest.raises(ValueError, match="participant: connection reset"):
+        GetTablesInfo(workspace=workspace, schema_cache=schema_cache).run()
+
+
+def test_schema_cache_hit(schema_cache):
+    workspace = FakeWorkspace({"sample": SAMPLE_ROWS})
+    first_info, first_inferred = run_counting_inference(workspace, schema_cache)
+    second_info, second_inferred = run_counting_inference(workspace, schema_cache)
+    assert (first_inferred, second_inferred) == (1, 0)
+    assert first_info == second_info
+
+
+def test_schema_cache_miss_on_changed_contents(schema_cache):
+    run_counting_inference(FakeWorkspace({"sample": SAMPLE_ROWS}), schema_cache)
+    changed_rows = SAMPLE_ROWS + [{"entityType": "sample", "name": "S3", "attributes": {"age": "unknown"}}]
+    tables_info, inferred = run_counting_inference(FakeWorkspace({"sample": changed_rows}), schema_cache)
+    assert inferred == 1
+    assert tables_info["sample"]["column_info"]["age"]["inferred_data_type"] == "string"
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [
+        ("SCHEMA_CACHE_VERSION", terra_summary_statistics.SCHEMA_CACHE_VERSION + 1),
+        ("ALL_FIELDS_NON_REQUIRED", not terra_summary_statistics.ALL_FIELDS_NON_REQUIRED),
+        ("FORCE_COLUMNS_TO_STRING", not terra_summary_statistics.FORCE_COLUMNS_TO_STRING),
+    ]
+)
+def test_schema_cache_invalidated_by_settings(schema_cache, monkeypatch, setting, value):
+    workspace = FakeWorkspace({"sample": SAMPLE_ROWS})
+    run_counting_inference(workspace, schema_cache)
+    monkeypatch.setattr(terra_summary_statistics, setting, value)
+    _, inferred = run_counting_inference(workspace, schema_cache)
+    assert inferred == 1, f"Cached schema was used after {setting} changed"
+
+
+def test_no_schema_cache():
+    workspace = FakeWorkspace({"sample": SAMPLE_ROWS})
+    _, first_inferred = run_counting_inference(workspace, None)
+    _, second_inferred = run_counting_inference(workspace, None)
+    assert (first_inferred, second_inferred) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "cell_value, expected",
+    [
+        pytest.param("blood", ("blood", None), id="plain_value"),
+        pytest.param(None, (None, None), id="empty_cell"),
+        pytest.param(
+            {"entityType": "participant", "entityName": "P1"}, ("P1", "participant.participant_id"), id="entity"
+        ),
+        pytest.param(
+            {"itemsType": "EntityReference", "items": [
+                {"entityType": "participant", "entityName": "P1"}, {"entityType": "participant", "entityName": "P2"}
+            ]},
+            (["P1", "P2"], "participant.participant_id"),
+            id="entity_list"
+        ),
+        pytest.param({"itemsType": "AttributeValue", "items": ["a", "b"]}, (["a", "b"], None), id="value_list"),
+        pytest.param({"itemsType": "AttributeValue", "items": []}, ([], None), id="empty_list"),
+        pytest.param({"key": "value"}, ({"key": "value"}, None), id="other_dict"),
+    ]
+)
+def test_convert_cell(cell_value, expected):
+    assert GetTablesInfo(workspace=FakeWorkspace({}))._convert_cell(cell_value) == expected
+
+
+def test_get_tables_info_stats():
+    sample_rows = [
+        {"entityType": "sample", "name": "S1", "attributes": {
+            "tissue": "blood", "mixed": 1, "tags": {"itemsType": "AttributeValue", "items": ["b", "a"]},
+            "participant": {"entityType": "participant", "entityName": "P1"}
+        }},
+        {"entityType": "sample", "name": "S2", "attributes": {
+            "tissue": "", "mixed": "one", "tags": {"itemsType": "AttributeValue", "items": ["a", "b"]},
+            "participant": {"entityType": "participant", "entityName": "P1"}
+        }},
+        {"entityType": "sample", "name": "S3", "attributes": {
+            "tissue": "blood", "tags": {"itemsType": "AttributeValue", "items": []}
+        }},
+    ]
+    tables_info = GetTablesInfo(workspace=FakeWorkspace({"sample": sample_rows})).run()
+    sample_info = tables_info["sample"]
+    column_info = sample_info["column_info"]
+
+    assert sample_info["primary_key"] == "sample_id"
+    assert sample_info["total_rows"] == 3
+    assert list(column_info) == ["sample_id", "tissue", "mixed", "tags", "participant"]
+    # Cells missing from a row are left out of the column's values
+    assert sample_info["table_columns"]["mixed"] == [1, "one"]
+    assert sample_info["table_columns"]["participant"] == ["P1", "P1"]
+
+    # (empty cells, distinct values, linked column, primary key) for each column
+    column_stats = {
+        column_name: (
+            column_dict["empty_cells"], column_dict["distinct_values"], column_dict["linked_column"],
+            column_dict["primary_key"]
+        )
+        for column_name, column_dict in column_info.items()
+    }
+    assert column_stats == {
+        "sample_id": (0, 3, None, True),
+        # Empty strings are empty cells and also a distinct value
+        "tissue": (1, 2, None, False),
+        # Mixed types are counted without Arrow, and the row without the column is an empty cell
+        "mixed": (1, 2, None, False),
+        # Lists are compared by their sorted values and an empty list is an empty cell
+        "tags": (1, 2, None, False),
+        "participant": (1, 1, "participant.participant_id", False),
+    }
+    assert all(column_dict["record_count"] == 3 for column_dict in column_info.values())
+    assert column_info["tags"]["inferred_multiple_values_allowed"] is True
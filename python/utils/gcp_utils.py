@@ -63,11 +63,14 @@ class GCPCloudFunctions:
         Returns:
             Any: The GCS blob object.
         """
+        from google.api_core.exceptions import NotFound
         file_path_components = self._process_cloud_path(full_path)
         blob = self.client.bucket(file_path_components["bucket"]).blob(file_path_components["blob_url"])
-        # If blob exists in GCS reload it so metadata is there
-        if blob.exists():
+        # Reload the blob so metadata is there. A blob that does not exist in GCS is returned without metadata
+        try:
             blob.reload()
+        except NotFound:
+            pass
         return blob
 
     @staticmethod
@@ -137,7 +140,8 @@ class GCPCloudFunctions:
                              file_extensions_to_ignore: list[str] = [],
                              file_strings_to_ignore: list[str] = [],
                              file_extensions_to_include: list[str] = [],
-                             file_name_only: bool = False) -> list[dict]:
+                             file_name_only: bool = False,
+                             prefix: Optional[str] = None) -> list[dict]:
         """
         List contents of a GCS bucket and return a list of dictionaries with file information.
 
@@ -147,6 +151,8 @@ class GCPCloudFunctions:
             file_strings_to_ignore (list[str], optional): List of file name substrings to ignore. Defaults to [].
             file_extensions_to_include (list[str], optional): List of file extensions to include. Defaults to [].
             file_name_only (bool, optional): Whether to return only the file list and no extra info. Defaults to False.
+            prefix (Optional[str], optional): Only list files whose path in the bucket starts with this prefix.
+                Defaults to None, which lists the whole bucket.
 
         Returns:
             list[dict]: A list of dictionaries containing file information.
@@ -154,8 +160,10 @@ class GCPCloudFunctions:
         # If the bucket name starts with gs://, remove it
         if bucket_name.startswith("gs://"):
             bucket_name = bucket_name.split("/")[2].strip()
-        logging.info(f"Running list_blobs on gs://{bucket_name}/")
-        blobs = self.client.list_blobs(bucket_name)
+        logging.info(f"Running list_blobs on gs://{bucket_name}/{prefix or ''}")
+        # Only request the metadata used in _create_bucket_contents_dict to cut down the listing response size
+        blob_fields = "name" if file_name_only else "name,contentType,size,md5Hash"
+        blobs = self.client.list_blobs(bucket_name, prefix=prefix, fields=f"items({blob_fields}),nextPageToken")
         logging.info("Finished running. Processing files now")
         # Create a list of dictionaries containing file information
         file_list = [
@@ -255,8 +263,9 @@ class GCPCloudFunctions:
         src_blob = self.load_blob_from_full_path(src_cloud_path)
         dest_blob = self.load_blob_from_full_path(dest_cloud_path)
 
-        # If either blob is None or does not exist
-        if not src_blob or not dest_blob or not src_blob.exists() or not dest_blob.exists():
+        # If either blob is None or does not exist. Metadata (including the generation) is only loaded for blobs
+        # that exist, so check that instead of making another request for each blob
+        if not src_blob or not dest_blob or src_blob.generation is None or dest_blob.generation is None:
             return False
         # If the MD5 hashes exist
         if src_blob.md5_hash and dest_blob.md5_hash:
@@ -1,27 +1,42 @@
 
 import functools
-import inspect
+import sys
 from pathlib import Path
 from typing import Any
 import responses
 import responses._recorder
 import git
+import yaml
 
+# The libyaml loader parses much faster than the pure Python one, but is only there when PyYAML was built with libyaml
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class _RequestsMock(responses.RequestsMock):
+    def _parse_response_file(self, file_path: Any) -> dict:
+        # responses parses the recorded file with yaml.safe_load, which always uses the pure Python loader
+        with open(file_path) as file:
+            return yaml.load(file, Loader=YAML_LOADER)
 
-def make_filename(func: Any) -> Path:
-    module = inspect.getmodule(func)
 
-    file_path = Path(module.__file__)  # type: ignore[union-attr, arg-type]
+@functools.lru_cache(maxsize=None)
+def _get_git_root(file_path: Path) -> Path:
+    # Finding the repo walks up the directory tree and rev-parse runs git in a subprocess, so only do it once per file
     repo = git.Repo(file_path, search_parent_directories=True)
-    git_root = repo.git.rev_parse("--show-toplevel")
-    return Path(git_root).joinpath("mock_output.yaml")
+    return Path(repo.git.rev_parse("--show-toplevel"))
+
+
+def make_filename(func: Any) -> Path:
+    # The function's module is already imported, so look it up directly instead of searching with inspect
+    file_path = Path(sys.modules[func.__module__].__file__)  # type: ignore[arg-type]
+    return _get_git_root(file_path).joinpath("mock_output.yaml")
 
 
 def activate_responses() -> Any:
     def outer_decorator(func: Any) -> Any:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            with responses.RequestsMock() as rsp:
+            with _RequestsMock() as rsp:
                 rsp._add_from_file(file_path=make_filename(func))
                 return func(*args, **kwargs)
 
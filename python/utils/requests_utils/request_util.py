@@ -2,6 +2,7 @@ from typing import Any, Optional
 from .mock_util import mock_responses
 import requests
 import backoff
+from requests.adapters import HTTPAdapter
 
 
 GET = "GET"
@@ -27,6 +28,10 @@ class RunRequest:
         self.max_backoff_time = max_backoff_time
         self.token = token
         self.create_mocks = create_mocks
+        # Reuse one session for every request so connections to the same host are kept alive between requests.
+        # The pool is larger than the default of 10 so threads sharing this instance can each keep a connection
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
 
     @staticmethod
     def _create_backoff_decorator(max_tries: int, factor: int, max_time: int) -> Any:
@@ -87,30 +92,30 @@ class RunRequest:
         @backoff_decorator
         def _make_request() -> requests.Response:
             if method == GET:
-                response = requests.get(
+                response = self.session.get(
                     uri,
                     headers=self.create_headers(content_type=content_type),
                     params=params
                 )
             elif method == POST:
-                response = requests.post(
+                response = self.session.post(
                     uri,
                     headers=self.create_headers(content_type=content_type),
                     data=data
                 )
             elif method == DELETE:
-                response = requests.delete(
+                response = self.session.delete(
                     uri,
                     headers=self.create_headers(content_type=content_type)
                 )
             elif method == PATCH:
-                response = requests.patch(
+                response = self.session.patch(
                     uri,
                     headers=self.create_headers(content_type=content_type),
                     data=data
                 )
             elif method == PUT:
-                response = requests.put(
+                response = self.session.put(
                     uri,
                     headers=self.create_headers(content_type=content_type),
                     data=data
@@ -160,7 +165,7 @@ class RunRequest:
             str: The response text from the request.
         """
         headers = self.create_headers(accept=None)
-        response = requests.post(uri, headers=headers, files=data)
+        response = self.session.post(uri, headers=headers, files=data)
         if 300 <= response.status_code or response.status_code < 200:
             print(response.text)
             response.raise_for_status()  # Raise an exception for non-200 status codes
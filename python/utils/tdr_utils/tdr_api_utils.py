@@ -32,6 +32,9 @@ class TDR:
             request_util (Any): Utility for making HTTP requests.
         """
         self.request_util = request_util
+        # Results of check_if_dataset_exists keyed by (dataset_name, billing_profile). Entries are dropped when a
+        # dataset with that name is created or deleted through this instance
+        self._dataset_lookup_cache: dict[tuple[str, Optional[str]], list[dict]] = {}
 
     def get_data_set_files(
             self,
@@ -75,9 +78,28 @@ class TDR:
         Returns:
             list[dict]: A list of dictionaries containing the metadata of the files in the dataset.
         """
+        return list(self.yield_data_set_files(dataset_id=dataset_id, limit=limit))
+
+    def yield_data_set_files(
+            self,
+            dataset_id: str,
+            limit: int = ARG_DEFAULTS['batch_size_to_list_files']  # type: ignore[assignment]
+    ) -> Any:
+        """
+        Yield all files in a dataset, one batch at a time. Use instead of get_data_set_files when the files can be
+        processed one by one, so the whole list is not held in memory and batches that are not used are never
+        requested. Each file is the same json as get_data_set_files.
+
+        Args:
+            dataset_id (str): The ID of the dataset.
+            limit (int, optional): The maximum number of records to retrieve per batch. Defaults to 1000.
+
+        Yields:
+            Any: A generator yielding dictionaries containing the metadata of the files in the dataset.
+        """
         uri = f"{self.TDR_LINK}/datasets/{dataset_id}/files"
         logging.info(f"Getting all files in dataset {dataset_id}")
-        return self._get_response_from_batched_endpoint(uri=uri, limit=limit)
+        yield from self._yield_from_batched_endpoint(uri=uri, limit=limit)
 
     def create_file_dict(
             self,
@@ -96,7 +118,7 @@ class TDR:
         """
         return {
             file_dict['fileId']: file_dict
-            for file_dict in self.get_data_set_files(dataset_id=dataset_id, limit=limit)
+            for file_dict in self.yield_data_set_files(dataset_id=dataset_id, limit=limit)
         }
 
     def create_file_uuid_dict_for_ingest_for_experimental_self_hosted_dataset(
@@ -119,7 +141,7 @@ class TDR:
         """
         return {
             file_dict['fileDetail']['accessUrl']: file_dict['fileId']
-            for file_dict in self.get_data_set_files(dataset_id=dataset_id, limit=limit)
+            for file_dict in self.yield_data_set_files(dataset_id=dataset_id, limit=limit)
         }
 
     def get_sas_token(self, snapshot_id: str = "", dataset_id: str = "") -> dict:
@@ -250,6 +272,10 @@ class TDR:
         response = self.request_util.run_request(uri=uri, method=DELETE)
         job_id = response.json()['id']
         MonitorTDRJob(tdr=self, job_id=job_id, check_interval=30, return_json=False).run()
+        self._dataset_lookup_cache = {
+            key: datasets for key, datasets in self._dataset_lookup_cache.items()
+            if all(dataset["id"] != dataset_id for dataset in datasets)
+        }
 
     def get_snapshot_info(
             self,
@@ -368,7 +394,8 @@ class TDR:
 
     def check_if_dataset_exists(self, dataset_name: str, billing_profile: Optional[str] = None) -> list[dict]:
         """
-        Check if a dataset exists by name and optionally by billing profile.
+        Check if a dataset exists by name and optionally by billing profile. Results are cached on this instance
+        until a dataset with the same name is created or deleted through it.
 
         Args:
             dataset_name (str): The name of the dataset to check.
@@ -377,6 +404,9 @@ class TDR:
         Returns:
             list[dict]: A list of matching datasets.
         """
+        cache_key = (dataset_name, billing_profile)
+        if cache_key in self._dataset_lookup_cache:
+            return list(self._dataset_lookup_cache[cache_key])
         matching_datasets = []
         for dataset in self._yield_existing_datasets(filter=dataset_name):
             # Search uses wildcard so could grab more datasets where dataset_name is substring
@@ -399,7 +429,8 @@ class TDR:
                             f"Dataset {dataset_name} already exists but is not under billing profile {billing_profile}")
                 else:
                     matching_datasets.append(dataset)
-        return matching_datasets
+        self._dataset_lookup_cache[cache_key] = matching_datasets
+        return list(matching_datasets)
 
     def get_dataset_info(self, dataset_id: str, info_to_include: Optional[list[str]] = None) -> dict:
         """
@@ -849,6 +880,9 @@ class TDR:
         job_results = MonitorTDRJob(tdr=self, job_id=job_id, check_interval=30, return_json=True).run()
         dataset_id = job_results["id"]  # type: ignore[index]
         logging.info(f"Successfully created dataset {dataset_name}: {dataset_id}")
+        self._dataset_lookup_cache = {
+            key: datasets for key, datasets in self._dataset_lookup_cache.items() if key[0] != dataset_name
+        }
         return dataset_id
 
     def update_dataset_schema(  # type: ignore[return]
@@ -899,35 +933,49 @@ class TDR:
         logging.info(f"Successfully ran schema updates in dataset {dataset_id}")
         return dataset_id
 
-    def _get_response_from_batched_endpoint(self, uri: str, limit: int = 1000) -> list[dict]:
+    def _yield_from_batched_endpoint(self, uri: str, limit: int = 1000) -> Any:
         """
         Helper method for all GET endpoints that require batching. Given the URI and the limit (optional), will
-        loop through batches until all metadata is retrieved.
+        loop through batches and yield each record, only requesting the next batch once the previous one is used.
 
         Args:
             uri (str): The base URI for the endpoint (without query params for offset or limit).
             limit (int, optional): The maximum number of records to retrieve per batch. Defaults to 1000.
 
-        Returns:
-            list[dict]: A list of dictionaries containing the metadata retrieved from the endpoint.
+        Yields:
+            Any: A generator yielding the metadata retrieved from the endpoint.
         """
         batch = 1
         offset = 0
-        metadata: list = []
+        total_records = 0
         while True:
             logging.info(f"Retrieving {(batch - 1) * limit} to {batch * limit} records in metadata")
             response_json = self.request_util.run_request(uri=f"{uri}?offset={offset}&limit={limit}", method=GET).json()
 
             # If no more files, break the loop
             if not response_json:
-                logging.info(f"No more results to retrieve, found {len(metadata)} total records")
+                logging.info(f"No more results to retrieve, found {total_records} total records")
                 break
 
-            metadata.extend(response_json)
+            total_records += len(response_json)
+            yield from response_json
             # Increment the offset by limit for the next page
             offset += limit
             batch += 1
-        return metadata
+
+    def _get_response_from_batched_endpoint(self, uri: str, limit: int = 1000) -> list[dict]:
+        """
+        Helper method for all GET endpoints that require batching. Given the URI and the limit (optional), will
+        loop through batches until all metadata is retrieved.
+
+        Args:
+            uri (str): The base URI for the endpoint (without query params for offset or limit).
+            limit (int, optional): The maximum number of records to retrieve per batch. Defaults to 1000.
+
+        Returns:
+            list[dict]: A list of dictionaries containing the metadata retrieved from the endpoint.
+        """
+        return list(self._yield_from_batched_endpoint(uri=uri, limit=limit))
 
     def get_files_from_snapshot(self, snapshot_id: str, limit: int = 1000) -> list[dict]:
         """
@@ -11,9 +11,13 @@ class MonitorTDRJob:
     Attributes:
         tdr (TDR): An instance of the TDR class.
         job_id (str): The ID of the job to be monitored.
-        check_interval (int): The interval in seconds to wait between status checks.
+        check_interval (int): The longest interval in seconds to wait between status checks.
     """
 
+    # Short jobs are checked again quickly, then the wait grows by BACKOFF_MULTIPLIER up to check_interval
+    INITIAL_CHECK_INTERVAL = 1
+    BACKOFF_MULTIPLIER = 1.5
+
     def __init__(self, tdr: Any, job_id: str, check_interval: int, return_json: bool):
         """
         Initialize the MonitorTDRJob class.
@@ -21,7 +25,8 @@ class MonitorTDRJob:
         Args:
             tdr (TDR): An instance of the TDR class.
             job_id (str): The ID of the job to be monitored.
-            check_interval (int): The interval in seconds to wait between status checks.
+            check_interval (int): The longest interval in seconds to wait between status checks. Checks start
+                INITIAL_CHECK_INTERVAL seconds apart and back off up to this interval.
             return_json (bool): Whether to get and return the result of the job as json.
         """
         self.tdr = tdr
@@ -47,12 +52,14 @@ class MonitorTDRJob:
         Returns:
             dict: The result of the job.
         """
+        wait_interval: float = min(self.INITIAL_CHECK_INTERVAL, self.check_interval)
         while True:
             ingest_response = self.tdr.get_job_status(self.job_id)
             if ingest_response.status_code == 202:
                 logging.info(f"TDR job {self.job_id} is still running")
-                # Check every x seconds if ingest is still running
-                time.sleep(self.check_interval)
+                # Wait longer between each check while the job is still running, up to check_interval
+                time.sleep(wait_interval)
+                wait_interval = min(wait_interval * self.BACKOFF_MULTIPLIER, self.check_interval)
             elif ingest_response.status_code == 200:
                 response_json = json.loads(ingest_response.text)
                 if response_json["job_status"] == "succeeded":
@@ -168,7 +168,7 @@ class TerraWorkspace:
         self.workspace_id = None
         self.resource_id = None
         self.storage_container = None
-        self.bucket = None
+        self.bucket: Optional[str] = None
         self.wds_url = None
         self.account_url: Optional[str] = None
         self.request_util = request_util
@@ -248,17 +248,28 @@ class TerraWorkspace:
             error_to_report += base_error_message
             raise ValueError(error_to_report)
 
-    def get_workspace_info(self) -> dict:
+    def get_workspace_info(self, continue_not_found: bool = False) -> dict:
         """
         Get workspace information.
 
+        Args:
+            continue_not_found (bool, optional): Whether to accept a 404 response. Defaults to False.
+
         Returns:
-            dict: The JSON response containing workspace information.
+            dict: The JSON response containing workspace information. Empty if the workspace was not found and
+                continue_not_found is True.
         """
         url = f"{TERRA_LINK}/workspaces/{self.billing_project}/{self.workspace_name}"
         logging.info(
             f"Getting workspace info for {self.billing_project}/{self.workspace_name}")
-        response = self.request_util.run_request(uri=url, method=GET)
+        response = self.request_util.run_request(
+            uri=url,
+            method=GET,
+            accept_return_codes=[404] if continue_not_found else []
+        )
+        if response.status_code == 404:
+            logging.warning(f"Workspace {self.billing_project}/{self.workspace_name} not found")
+            return {}
         return json.loads(response.text)
 
     def _set_resource_id_and_storage_container(self) -> None:
@@ -426,12 +437,15 @@ class TerraWorkspace:
 
     def get_workspace_bucket(self) -> str:
         """
-        Get the workspace bucket name. Does not include the gs:// prefix.
+        Get the workspace bucket name. Does not include the gs:// prefix. The bucket does not change for the life
+        of a workspace, so it is only looked up once.
 
         Returns:
             str: The bucket name.
         """
-        return self.get_workspace_info()["workspace"]["bucketName"]
+        if not self.bucket:
+            self.bucket = self.get_workspace_info()["workspace"]["bucketName"]
+        return self.bucket
 
     def get_workspace_entity_info(self, use_cache: bool = True) -> dict:
         """
@@ -484,30 +498,19 @@ class TerraWorkspace:
         Returns:
             dict: The JSON response containing the updated ACL.
         """
-        url = f"{TERRA_LINK}/workspaces/{self.billing_project}/{self.workspace_name}/acl?" + \
-              f"inviteUsersNotFound={str(invite_users_not_found).lower()}"
-        payload = {
-            "email": email,
-            "accessLevel": access_level,
-            "canShare": can_share,
-            "canCompute": can_compute,
-        }
         logging.info(
             f"Updating user {email} to {access_level} in workspace {self.billing_project}/{self.workspace_name}")
-        response = self.request_util.run_request(
-            uri=url,
-            method=PATCH,
-            content_type="application/json",
-            data="[" + json.dumps(payload) + "]"
+        return self.update_multiple_users_acl(
+            acl_list=[
+                {
+                    "email": email,
+                    "accessLevel": access_level,
+                    "canShare": can_share,
+                    "canCompute": can_compute,
+                }
+            ],
+            invite_users_not_found=invite_users_not_found
         )
-        request_json = response.json()
-        if request_json["usersNotFound"] and not invite_users_not_found:
-            # Will be a list of one user
-            user_not_found = request_json["usersNotFound"][0]
-            raise Exception(
-                f'The user {user_not_found["email"]} was not found and access was not updated'
-            )
-        return request_json
 
     def put_metadata_for_library_dataset(self, library_metadata: dict, validate: bool = False) -> dict:
         """
@@ -552,7 +555,6 @@ class TerraWorkspace:
         )
         request_json = response.json()
         if request_json["usersNotFound"] and not invite_users_not_found:
-            # Will be a list of one user
             users_not_found = [u["email"] for u in request_json["usersNotFound"]]
             raise Exception(
                 f"The following users were not found and access was not updated: {users_not_found}"
@@ -697,6 +699,8 @@ class TerraWorkspace:
             uri=f"{TERRA_LINK}/workspaces/{self.billing_project}/{self.workspace_name}",
             method=DELETE
         )
+        # A workspace created again with the same name gets a new bucket
+        self.bucket = None
         return response
 
     def update_workspace_attributes(self, attributes: list[dict]) -> None:
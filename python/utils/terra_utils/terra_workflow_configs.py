@@ -1,6 +1,7 @@
 import os
 import yaml  # type: ignore[import]  # noqa: F401
 import re
+from functools import lru_cache
 from .terra_util import TerraWorkspace
 from .. import ARG_DEFAULTS
 import logging
@@ -16,6 +17,19 @@ YAML_FILE_FULL_PATH = os.path.join(SCRIPT_DIR, DOCKSTORE_YAML)
 WDL_ROOT_DIR_FULL_PATH = os.path.join(SCRIPT_DIR, WDL_ROOT_DIR)
 
 
+@lru_cache(maxsize=None)
+def _load_dockstore_yaml() -> dict:
+    """
+    Load the dockstore YAML file. The file does not change while running, so it is only read and parsed once.
+    Callers must not modify the returned dictionary.
+
+    Returns:
+        dict: The parsed YAML file.
+    """
+    with open(YAML_FILE_FULL_PATH, 'r') as file:
+        return yaml.safe_load(file)
+
+
 class GetWorkflowNames:
     def __init__(self) -> None:
         """
@@ -24,8 +38,7 @@ class GetWorkflowNames:
         Loads the YAML file and extracts workflow names.
         """
         # Load the YAML file
-        with open(YAML_FILE_FULL_PATH, 'r') as file:
-            yaml_data = yaml.safe_load(file)
+        yaml_data = _load_dockstore_yaml()
 
         # Extract workflow names and store them
         self.workflow_names = [
@@ -77,8 +90,7 @@ class WorkflowConfigs:
             raise ValueError(f"Workflow name {workflow_name} not found in {YAML_FILE_FULL_PATH}: {available_workflows}")
 
         # Load the YAML file
-        with open(YAML_FILE_FULL_PATH, 'r') as file:
-            yaml_data = yaml.safe_load(file)
+        yaml_data = _load_dockstore_yaml()
         # Extract specific workflow information from yaml_data
         self.yaml_info = next(workflow for workflow in yaml_data['workflows'] if workflow['name'] == self.workflow_name)
         self.workflow_info = self._create_workflow_info_dict()
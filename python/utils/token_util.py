@@ -3,6 +3,7 @@ import pytz
 import logging
 import requests
 import os
+from threading import Lock
 from typing import Optional, Union
 from datetime import datetime, timedelta
 
@@ -14,6 +15,8 @@ class Token:
         self.cloud = cloud
         self.expiry: Optional[datetime] = None
         self.token_string: Optional[str] = ""
+        # Tokens are shared across threads (e.g. MultiThreadedJobs) so only let one thread refresh at a time
+        self._refresh_lock = Lock()
         # If provided with a file just use the contents of file
         if token_file:
             self.token_file = token_file
@@ -43,17 +46,18 @@ class Token:
                 raise ValueError(f"Cloud {self.cloud} not supported. Must be {GCP} or {AZURE}")
 
     def _get_gcp_token(self) -> Union[str, None]:
-        # Refresh token if it has not been set or if it is expired or close to expiry
-        if not self.token_string or not self.expiry or self.expiry < datetime.now(pytz.UTC) + timedelta(minutes=5):
-            http = httplib2.Http()
-            self.credentials.refresh(http)
-            self.token_string = self.credentials.get_access_token().access_token
-            # Set expiry to use UTC since google uses that timezone
-            self.expiry = self.credentials.token_expiry.replace(tzinfo=pytz.UTC)  # type: ignore[union-attr]
-            # Convert expiry time to EST for logging
-            est_expiry = self.expiry.astimezone(pytz.timezone("US/Eastern"))  # type: ignore[union-attr]
-            logging.info(f"New token expires at {est_expiry} EST")
-        return self.token_string
+        with self._refresh_lock:
+            # Refresh token if it has not been set or if it is expired or close to expiry
+            if not self.token_string or not self.expiry or self.expiry < datetime.now(pytz.UTC) + timedelta(minutes=5):
+                http = httplib2.Http()
+                self.credentials.refresh(http)
+                self.token_string = self.credentials.get_access_token().access_token
+                # Set expiry to use UTC since google uses that timezone
+                self.expiry = self.credentials.token_expiry.replace(tzinfo=pytz.UTC)  # type: ignore[union-attr]
+                # Convert expiry time to EST for logging
+                est_expiry = self.expiry.astimezone(pytz.timezone("US/Eastern"))  # type: ignore[union-attr]
+                logging.info(f"New token expires at {est_expiry} EST")
+            return self.token_string
 
     def _get_az_token(self) -> Union[str, None]:
         # This is not working... Should also check about timezones once it does work
@@ -64,13 +68,17 @@ class Token:
         return self.token_string
 
     def _get_sa_token(self) -> Union[str, None]:
-        if not self.token_string or not self.expiry or self.expiry < datetime.now(pytz.UTC) + timedelta(minutes=5):
-            SCOPES = ['https://www.googleapis.com/auth/userinfo.profile',
-                      'https://www.googleapis.com/auth/userinfo.email']
-            url = f"http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token?scopes={','.join(SCOPES)}"  # noqa: E501
-            token_response = requests.get(url, headers={'Metadata-Flavor': 'Google'})
-            self.token_string = token_response.json()['access_token']
-        return token_response.json()['access_token']
+        with self._refresh_lock:
+            # Refresh token if it has not been set or if it is expired or close to expiry
+            if not self.token_string or not self.expiry or self.expiry < datetime.now(pytz.UTC) + timedelta(minutes=5):
+                SCOPES = ['https://www.googleapis.com/auth/userinfo.profile',
+                          'https://www.googleapis.com/auth/userinfo.email']
+                url = f"http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token?scopes={','.join(SCOPES)}"  # noqa: E501
+                token_json = requests.get(url, headers={'Metadata-Flavor': 'Google'}).json()
+                self.token_string = token_json['access_token']
+                # expires_in is the number of seconds the token is valid for
+                self.expiry = datetime.now(pytz.UTC) + timedelta(seconds=token_json['expires_in'])
+            return self.token_string
 
     def get_token(self) -> Union[str, None]:
         # If token file provided then always return contents